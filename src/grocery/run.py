@@ -7,15 +7,102 @@ Implementation will be built tool-by-tool via TDD.
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
-import subprocess
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import cache
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
 from grocery.tools import gtasks, library, fuzzy_ui
-from grocery.tools.errors import GroceryError, hyvee_setup_required
-from grocery.tools.hyvee import build_search_url
+from grocery.tools.errors import GroceryError, hyvee_setup_required, products_file_invalid
 from grocery.tools import hyvee
 
+# absolute() is a pure path join; resolve() would stat/readlink every component.
+_REPO_ROOT = Path(__file__).absolute().parents[2]
+_DATA_DIR = _REPO_ROOT / "data"
+
+_SEP = "=" * 60
+
+# Phase banners, each printed with a single write (header first, so a
+# non-interactive run can stop after it).
+_FUZZY_HEADER = f"""
+{_SEP}
+STEP 1: FUZZY MATCH EXISTING PRODUCTS
+{_SEP}
+Found {{count}} unmapped item(s)."""
+_FUZZY_INSTRUCTIONS = f"""
+Before searching Hy-Vee, let's check if these are just
+different phrasings of products you've already mapped.
+
+{_SEP}
+📋 Fuzzy match UI: {{html}}
+   Open in browser: {{url}}
+{_SEP}
+
+INSTRUCTIONS:
+  1. Edit item names inline (click to fix voice-to-text errors)
+  2. Review fuzzy matches (top 3 shown) and click to map
+  3. Or browse full product list, or mark as 'NEW'
+  4. Click 'Update List Details' button
+
+  The script will:
+    - Add variations to products.json original_requests
+    - Rename edited tasks in Google Tasks
+    - Refresh the page automatically
+
+  Items marked 'NEW' will be shown in Hy-Vee search UI next.
+  (Or re-run with --skip-fuzzy to go straight to Hy-Vee search)
+{_SEP}
+"""
+_SEARCH_HEADER = f"""
+{_SEP}
+STEP 2: HY-VEE PRODUCT SEARCH
+{_SEP}
+Found {{count}} item(s) that need Hy-Vee product URLs."""
+_SEARCH_INSTRUCTIONS = f"""
+{_SEP}
+📋 Product search UI: {{html}}
+   Open in browser: file://{{html}}
+{_SEP}
+
+INSTRUCTIONS:
+  1. Click 🔍 to search Hy-Vee for each item
+  2. Paste product page URLs
+  3. Generate JSON and paste into:
+     data/products.json (under 'products')
+  4. Re-run this command
+{_SEP}
+"""
+
+# Last regenerate_fuzzy_html() input fingerprint and result, relative to repo_root.
+_FUZZY_STATE_FILE = Path(".cache") / "fuzzy_state.json"
+
+
+def _build_unmapped_items(normalized: list[dict], unmapped_names: Iterable[str]) -> list[dict]:
+    """
+    Collapse normalize() output to one entry per unmapped normalized name.
+
+    Keeps the first original title and sums quantities across duplicates.
+    """
+    unmapped_set = unmapped_names if isinstance(unmapped_names, (set, frozenset)) else set(unmapped_names)
+    out: dict[str, dict] = {}
+    for norm in normalized:
+        key = norm["normalized"]
+        if key not in unmapped_set:
+            continue
+        entry = out.get(key)
+        if entry is None:
+            out[key] = {"original": norm["original"], "normalized": key, "quantity": norm["quantity"]}
+        else:
+            entry["quantity"] += norm["quantity"]
+    return list(out.values())
+
 
 def regenerate_fuzzy_html(
     repo_root: Path,
@@ -28,39 +115,84 @@ def regenerate_fuzzy_html(
     Uses products.json as single source of truth (checks original_requests arrays).
     
     Returns path to HTML file if unmapped items exist, None otherwise.
+    If neither the open tasks nor products.json changed since the previous call
+    (see _FUZZY_STATE_FILE), the previous result is returned without re-rendering.
     """
     raw_titles = gtasks.fetch_open_task_titles(repo_root=repo_root, list_name=list_name)
+
+    # Same open tasks and same products.json as last time: the page on disk is
+    # still current, so skip normalize/verify/render.
+    state_path = repo_root / _FUZZY_STATE_FILE
+    state = _load_fuzzy_state(state_path)
+    fingerprint = _fuzzy_fingerprint(raw_titles, products_path)
+    cached = state.get(list_name)
+    if cached and cached.get("fingerprint") == fingerprint:
+        html = cached.get("html")
+        if html is None:
+            return None
+        if Path(html).is_file():
+            return Path(html)
+
+    output = _regenerate_fuzzy_html(repo_root, list_name, raw_titles, products_path)
+    state[list_name] = {"fingerprint": fingerprint, "html": str(output) if output else None}
+    _save_fuzzy_state(state_path, state)
+    return output
+
+
+def _regenerate_fuzzy_html(
+    repo_root: Path,
+    list_name: str,
+    raw_titles: list[str],
+    products_path: Path,
+) -> Path | None:
     normalized = gtasks.normalize(items=raw_titles)
-    normalized_names = [x["normalized"] for x in normalized]
     
-    # verify_all_mapped now checks original_requests arrays in products.json
-    _, unmapped_names = library.verify_all_mapped(products_path, normalized_names)
+    # One index for both the verify pass and the page; the file is parsed once.
+    products_index = library.load_products_index(products_path)
+    _, unmapped_names = library.verify_all_mapped(
+        products_index, (x["normalized"] for x in normalized)
+    )
     if not unmapped_names:
         return None
     
-    # Build rich unmapped items (with quantities from normalize())
-    # Deduplicate by normalized name, combining quantities
-    unmapped_dict = {}
-    for norm in normalized:
-        if norm["normalized"] in unmapped_names:
-            key = norm["normalized"]
-            if key in unmapped_dict:
-                # Combine quantities and keep the first original name
-                unmapped_dict[key]["quantity"] += norm["quantity"]
-            else:
-                unmapped_dict[key] = {
-                    "original": norm["original"],
-                    "normalized": norm["normalized"],
-                    "quantity": norm["quantity"],
-                }
-    unmapped_items = list(unmapped_dict.values())
+    unmapped_items = _build_unmapped_items(normalized, frozenset(unmapped_names))
     
-    return fuzzy_ui.generate_fuzzy_match_html(unmapped_items, products_path, repo_root)
+    return fuzzy_ui.generate_fuzzy_match_html(unmapped_items, products_index, repo_root, list_name=list_name)
+
+
+def _fuzzy_fingerprint(raw_titles: list[str], products_path: Path) -> str:
+    """Hash of the open task titles plus products.json's (mtime, size)."""
+    h = hashlib.blake2b(digest_size=8)
+    try:
+        st = products_path.stat()
+        h.update(f"{st.st_mtime_ns}:{st.st_size}".encode())
+    except OSError:
+        h.update(b"missing")
+    for title in sorted(raw_titles):
+        h.update(b"\0")
+        h.update(title.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _load_fuzzy_state(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_fuzzy_state(path: Path, state: dict) -> None:
+    # Best-effort: a failed write only means the next call re-renders.
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(state), encoding="utf-8")
+    except OSError:
+        pass
 
 
-def main() -> int:
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="grocery-run")
-    parser.add_argument("--list-name", required=True, help="Google Tasks list name (e.g., Groceries)")
+    parser.add_argument("--list-name", help="Google Tasks list name (e.g., Groceries)")
     parser.add_argument(
         "--move-item",
         action="append",
@@ -80,20 +212,35 @@ def main() -> int:
     )
     parser.add_argument(
         "--repo-root",
-        default=str(Path(__file__).resolve().parents[2]),
+        default=str(_REPO_ROOT),
         help="Repo root containing token.json/credentials.json",
     )
     parser.add_argument(
         "--products",
-        default=str(Path(__file__).resolve().parents[2] / "data" / "products.json"),
+        default=str(_DATA_DIR / "products.json"),
         help="Path to products.json",
     )
     parser.add_argument(
         "--unavailable",
-        default=str(Path(__file__).resolve().parents[2] / "data" / "unavailable.json"),
+        default=str(_DATA_DIR / "unavailable.json"),
         help="Path to unavailable.json log",
     )
     parser.add_argument("--headless", action="store_true", help="Run browser in headless mode")
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Reuse a long-lived browser across runs (launched on first use, stop with --stop-daemon)",
+    )
+    parser.add_argument(
+        "--stop-daemon",
+        action="store_true",
+        help="Shut down the browser started by --daemon and exit",
+    )
+    parser.add_argument(
+        "--full-sync",
+        action="store_true",
+        help="Re-fetch every open task instead of only those changed since the last run",
+    )
     parser.add_argument(
         "--skip-fuzzy",
         action="store_true",
@@ -104,7 +251,21 @@ def main() -> int:
         action="store_true",
         help="Ignore unmapped items and proceed with shopping for mapped items only (WARNING: will skip items!)",
     )
-    args = parser.parse_args()
+    return parser
+
+
+_PARSER = _build_parser()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _PARSER.parse_args(argv)
+
+    if args.stop_daemon:
+        stopped = hyvee.stop_daemon_browser()
+        print("Browser daemon stopped." if stopped else "No browser daemon running.")
+        return 0
+    if not args.list_name:
+        _PARSER.error("the following arguments are required: --list-name")
 
     repo_root = Path(args.repo_root)
     products_path = Path(args.products)
@@ -138,68 +299,62 @@ def main() -> int:
             print(f"Moved {moved} task(s) to list: {args.move_to_list}")
             return 0
 
-        raw_titles = gtasks.fetch_open_task_titles(repo_root=repo_root, list_name=args.list_name)
+        # Cheap local check first: a broken products path shouldn't cost a Tasks round trip.
+        if products_path.exists() and not products_path.is_file():
+            raise products_file_invalid(str(products_path), "not a regular file")
+
+        # Parse/index products.json while the Google Tasks request is in flight.
+        pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            titles_future = pool.submit(
+                gtasks.fetch_open_task_titles,
+                repo_root=repo_root,
+                list_name=args.list_name,
+                full_sync=args.full_sync,
+            )
+            try:
+                products_index = library.load_products_index(products_path)
+            except (OSError, ValueError) as e:
+                titles_future.cancel()
+                raise products_file_invalid(str(products_path), str(e)) from e
+            raw_titles = titles_future.result()
+        finally:
+            # Don't hold the error path until an in-flight fetch returns.
+            pool.shutdown(wait=False, cancel_futures=True)
         normalized = gtasks.normalize(items=raw_titles)
-        normalized_names = [x["normalized"] for x in normalized]
+        # Duplicate tasks ("milk" twice) would otherwise cost a second verify
+        # lookup and, worse, a second product-page round trip in the cart.
+        unique_items: dict[str, dict] = {}
+        for item in normalized:
+            unique_items.setdefault(item["normalized"], item)
+        normalized_names = list(unique_items)
+        duplicates = len(normalized) - len(normalized_names)
 
-        _, unmapped_names = library.verify_all_mapped(products_path, normalized_names)
+        _, unmapped_names = library.verify_all_mapped(products_index, normalized_names)
         if unmapped_names:
-            # Build rich unmapped items (with quantities from normalize())
-            # Deduplicate by normalized name, combining quantities
-            unmapped_dict = {}
-            for norm in normalized:
-                if norm["normalized"] in unmapped_names:
-                    key = norm["normalized"]
-                    if key in unmapped_dict:
-                        # Combine quantities and keep the first original name
-                        unmapped_dict[key]["quantity"] += norm["quantity"]
-                    else:
-                        unmapped_dict[key] = {
-                            "original": norm["original"],
-                            "normalized": norm["normalized"],
-                            "quantity": norm["quantity"],
-                        }
-            unmapped_items = list(unmapped_dict.values())
+            unmapped_set = frozenset(unmapped_names)
+            unmapped_items = _build_unmapped_items(normalized, unmapped_set)
             
             if not args.skip_fuzzy:
+                print(_FUZZY_HEADER.format(count=len(unmapped_items)))
+                _print_suggestions(unmapped_items, products_index)
+                if not _is_interactive():
+                    _print_unmapped_list(unmapped_items)
+                    return 1
+
                 # Phase 1: Fuzzy match against existing products (avoids unnecessary Hy-Vee searches)
-                fuzzy_html = fuzzy_ui.generate_fuzzy_match_html(unmapped_items, products_path, repo_root, list_name=args.list_name)
+                fuzzy_html = fuzzy_ui.generate_fuzzy_match_html(unmapped_items, products_index, repo_root, list_name=args.list_name)
                 
                 # Also generate Hy-Vee search HTML for navigation
                 if unmapped_items:
                     _generate_unmapped_html(unmapped_items, repo_root, list_name=args.list_name)
                 
-                print(f"\n{'='*60}")
-                print(f"STEP 1: FUZZY MATCH EXISTING PRODUCTS")
-                print(f"{'='*60}")
-                print(f"Found {len(unmapped_items)} unmapped item(s).")
-                print(f"\nBefore searching Hy-Vee, let's check if these are just")
-                print(f"different phrasings of products you've already mapped.")
-                print(f"\n{'='*60}")
                 # Use Flask server (port 8766) for both static files and API
                 http_url = f"http://127.0.0.1:8766/data/fuzzy_match_items.html"
-                
-                print(f"📋 Fuzzy match UI: {fuzzy_html}")
-                print(f"   Open in browser: {http_url}")
-                print(f"{'='*60}")
-                print(f"\nINSTRUCTIONS:")
-                print(f"  1. Edit item names inline (click to fix voice-to-text errors)")
-                print(f"  2. Review fuzzy matches (top 3 shown) and click to map")
-                print(f"  3. Or browse full product list, or mark as 'NEW'")
-                print(f"  4. Click 'Update List Details' button")
-                print(f"\n  The script will:")
-                print(f"    - Add variations to products.json original_requests")
-                print(f"    - Rename edited tasks in Google Tasks")
-                print(f"    - Refresh the page automatically")
-                print(f"\n  Items marked 'NEW' will be shown in Hy-Vee search UI next.")
-                print(f"  (Or re-run with --skip-fuzzy to go straight to Hy-Vee search)")
-                print(f"{'='*60}\n")
+                print(_FUZZY_INSTRUCTIONS.format(html=fuzzy_html, url=http_url))
                 
                 # Try to open in browser via HTTP (avoids file:// CORS issues)
-                try:
-                    subprocess.run(["open", http_url], check=False)
-                except Exception:
-                    pass  # Silently fail if 'open' isn't available
+                _open_in_browser(http_url)
                 
                 return 1
             else:
@@ -207,101 +362,201 @@ def main() -> int:
                     print(f"\n⚠️ WARNING: Ignoring {len(unmapped_items)} unmapped items as requested.")
                     print("Proceeding with shopping for mapped items only...")
                 else:
+                    print(_SEARCH_HEADER.format(count=len(unmapped_items)))
+                    if not _is_interactive():
+                        _print_unmapped_list(unmapped_items)
+                        return 1
+
                     # Phase 2: Hy-Vee product search for truly new items
                     unmapped_html = _generate_unmapped_html(unmapped_items, repo_root, list_name=args.list_name)
                     
-                    print(f"\n{'='*60}")
-                    print(f"STEP 2: HY-VEE PRODUCT SEARCH")
-                    print(f"{'='*60}")
-                    print(f"Found {len(unmapped_items)} item(s) that need Hy-Vee product URLs.")
-                    print(f"\n{'='*60}")
-                    print(f"📋 Product search UI: {unmapped_html}")
-                    print(f"   Open in browser: file://{unmapped_html}")
-                    print(f"{'='*60}")
-                    print(f"\nINSTRUCTIONS:")
-                    print(f"  1. Click 🔍 to search Hy-Vee for each item")
-                    print(f"  2. Paste product page URLs")
-                    print(f"  3. Generate JSON and paste into:")
-                    print(f"     data/products.json (under 'products')")
-                    print(f"  4. Re-run this command")
-                    print(f"{'='*60}\n")
+                    print(_SEARCH_INSTRUCTIONS.format(html=unmapped_html))
                     
                     # Try to open the HTML file automatically
-                    try:
-                        subprocess.run(["open", str(unmapped_html)], check=False)
-                    except Exception:
-                        pass  # Silently fail if 'open' isn't available
+                    _open_in_browser(unmapped_html.absolute().as_uri())
                     
                     return 1
 
         if args.ignore_unmapped and unmapped_names:
             # Filter out unmapped items
-            normalized_names = [n for n in normalized_names if n not in unmapped_names]
+            normalized_names = [n for n in normalized_names if n not in unmapped_set]
             print(f"Shopping for {len(normalized_names)} mapped items (skipping {len(unmapped_names)}).")
         else:
             print(f"All {len(normalized_names)} items mapped. Proceeding to cart...")
+        if duplicates:
+            print(f"({duplicates} duplicate task(s) collapsed.)")
 
-        playwright = browser = page = None
-        try:
+        page = None
+        # The browser is stopped on scope exit, after any debug dump below.
+        with ExitStack() as cleanup:
             try:
-                playwright, browser, page = hyvee.start_browser(headless=args.headless)
+                try:
+                    launch = hyvee.attach_daemon_browser if args.daemon else hyvee.start_browser
+                    playwright, browser, page = launch(headless=args.headless)
+                except Exception as e:
+                    raise hyvee_setup_required(str(e)) from e
+                cleanup.callback(_stop_browser_quietly, playwright, browser, page)
+
+                hyvee.ensure_logged_in(page)
+                hyvee.ensure_items_in_cart(
+                    page,
+                    products_path=products_path,
+                    items=list(unique_items.values()),
+                    unavailable_path=unavailable_path,
+                )
+                print("Cart update complete. Hard stop before checkout.")
+                return 0
             except Exception as e:
-                raise hyvee_setup_required(str(e)) from e
-
-            hyvee.ensure_logged_in(page)
-            hyvee.ensure_items_in_cart(
-                page,
-                products_path=products_path,
-                items=normalized,
-                unavailable_path=unavailable_path,
-            )
-            print("Cart update complete. Hard stop before checkout.")
-            return 0
-        except Exception as e:
-            # Dump debug info on any error
-            _dump_debug_info(page, e)
-            raise
-        finally:
-            try:
-                if playwright or browser or page:
-                    hyvee.stop_browser(playwright, browser, page)
-            except Exception:
-                # Cleanup errors shouldn't mask the primary result.
-                pass
+                # Dump debug info on any error
+                _dump_debug_info(page, e)
+                raise
     except GroceryError as e:
         print(e.format())
         return e.code
 
 
-def _generate_unmapped_html(unmapped: list[dict], repo_root: Path, list_name: str = "Groceries") -> Path:
-    """Generate an HTML file with clickable search links for unmapped items.
-    
-    Args:
-        unmapped: List of dicts with keys: original (or name), normalized, quantity
-        repo_root: Repo root directory
+# Exit code run_shopping() returns when its stop event ended the run (as for Ctrl-C).
+STOPPED_EXIT_CODE = 130
+
+# The run_shopping() call (if any) active on this thread; see _RoutedStream.
+_routed = threading.local()
+_routed_streams_lock = threading.Lock()
+
+
+class _StopRequested(BaseException):
     """
-    from datetime import datetime
-    
-    output_dir = repo_root / "data"
-    output_dir.mkdir(exist_ok=True)
-    output_file = output_dir / "unmapped_items.html"
-    
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    
-    rows = []
-    for i, item_obj in enumerate(unmapped):
-        item = item_obj.get("name") or item_obj.get("original") or item_obj.get("normalized")
-        quantity = item_obj.get("quantity", 1)
-        search_url = build_search_url(item)
-        # Escape HTML special characters and quotes for JS
-        safe_item = item.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        normalized = item_obj.get("normalized", item)
-        js_item = item.replace("\\", "\\\\").replace("'", "\\'").replace('"', '\\"')
-        js_normalized = normalized.replace("\\", "\\\\").replace("'", "\\'").replace('"', '\\"')
-        rows.append(f'''
-        <tr data-item="{js_normalized}" data-original="{js_item}" data-status="pending">
-            <td class="row-num">{i+1}</td>
-            <td class="item-name">{safe_item}</td>
+    Raised into a run_shopping() thread at its next output once stop is set.
+
+    A BaseException so the cart code's `except Exception` handlers don't swallow
+    it; main()'s ExitStack still closes the browser on the way out.
+    """
+
+
+class _LineRoute:
+    """Collects one thread's writes and hands complete lines to on_log."""
+
+    def __init__(self, on_log: Callable[[str], None], stop: threading.Event | None):
+        self._on_log = on_log
+        self._stop = stop
+        self._partial = ""
+
+    def write(self, text: str) -> None:
+        if self._stop is not None and self._stop.is_set():
+            raise _StopRequested
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._on_log(line.rstrip())
+
+    def close(self) -> None:
+        if self._partial:
+            self._on_log(self._partial.rstrip())
+            self._partial = ""
+
+
+class _RoutedStream:
+    """
+    sys.stdout/sys.stderr stand-in: writes from a thread inside run_shopping() go
+    to that call's on_log; every other thread writes straight through.
+    """
+
+    def __init__(self, stream: "Any"):
+        self._stream = stream
+
+    def write(self, text: str) -> int:
+        route = getattr(_routed, "route", None)
+        if route is None:
+            return self._stream.write(text)
+        route.write(text)
+        return len(text)
+
+    def flush(self) -> None:
+        if getattr(_routed, "route", None) is None:
+            self._stream.flush()
+
+    def isatty(self) -> bool:
+        if getattr(_routed, "route", None) is None:
+            return self._stream.isatty()
+        return False
+
+    def __getattr__(self, name: str) -> "Any":
+        return getattr(self._stream, name)
+
+
+def _install_routed_streams() -> None:
+    with _routed_streams_lock:
+        if not isinstance(sys.stdout, _RoutedStream):
+            sys.stdout = _RoutedStream(sys.stdout)
+        if not isinstance(sys.stderr, _RoutedStream):
+            sys.stderr = _RoutedStream(sys.stderr)
+
+
+def run_shopping(
+    *,
+    repo_root: Path,
+    list_name: str,
+    on_log: Callable[[str], None],
+    products_path: Path | None = None,
+    ignore_unmapped: bool = True,
+    stop: threading.Event | None = None,
+) -> int:
+    """
+    Run the cart phase (main() with --skip-fuzzy) on this thread; return its exit code.
+
+    For callers that already have the package loaded (the server's /phase3), so a
+    run costs no interpreter start or re-imports. Everything the run prints,
+    hyvee's progress lines included, goes to on_log one line at a time instead of
+    stdout; other threads' output is untouched. Setting stop ends the run at its
+    next line of output and returns STOPPED_EXIT_CODE.
+    """
+    if products_path is None:
+        products_path = Path(repo_root) / "data" / "products.json"
+    argv = [
+        "--list-name", list_name,
+        "--repo-root", str(repo_root),
+        "--products", str(products_path),
+        "--skip-fuzzy",
+    ]
+    if ignore_unmapped:
+        argv.append("--ignore-unmapped")
+
+    _install_routed_streams()
+    route = _LineRoute(on_log, stop)
+    _routed.route = route
+    try:
+        return main(argv)
+    except _StopRequested:
+        return STOPPED_EXIT_CODE
+    except SystemExit as e:  # argparse errors
+        return e.code if isinstance(e.code, int) else 1
+    except Exception:
+        import traceback
+
+        _routed.route = None
+        route.close()
+        for line in traceback.format_exc().splitlines():
+            on_log(line)
+        return 1
+    finally:
+        _routed.route = None
+        route.close()
+
+
+_TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+
+@cache
+def _unmapped_template() -> tuple[bytes, bytes]:
+    """Return templates/unmapped_items.html (UTF-8 bytes) split around its <!-- ROWS --> marker (read once)."""
+    data = (_TEMPLATES_DIR / "unmapped_items.html").read_bytes()
+    head, _, tail = data.partition(b"            <!-- ROWS -->\n")
+    return head, tail
+
+
+_UNMAPPED_HTML_ROW = '''
+        <tr data-item="{normalized}" data-original="{item}" data-status="pending">
+            <td class="row-num">{num}</td>
+            <td class="item-name">{item}</td>
             <td><a href="{search_url}" target="_blank" class="search-link">🔍</a></td>
             <td class="url-cell"><input type="text" class="url-input" placeholder="Paste URL..." /></td>
             <td class="qty-cell"><input type="number" class="qty-input" value="{quantity}" min="1" max="99" /></td>
@@ -312,600 +567,156 @@ def _generate_unmapped_html(unmapped: list[dict], repo_root: Path, list_name: st
                 <button class="amazon-btn" onclick="markAmazon(this)" title="Move to Amazon list">📦</button>
             </td>
             <td class="status-cell">⏳</td>
-        </tr>''')
-    
-    html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Product Mapping Tool</title>
-    <style>
-        * {{ box-sizing: border-box; }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            max-width: 1400px;
-            margin: 0 auto;
-            padding: 15px;
-            background: #0d1117;
-            color: #c9d1d9;
-            font-size: 14px;
-        }}
-        .header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 15px;
-        }}
-        h1 {{ color: #58a6ff; margin: 0; font-size: 24px; }}
-        .source-badge {{
-            background: #238636;
-            padding: 6px 12px;
-            border-radius: 20px;
-            font-size: 12px;
-            cursor: default;
-        }}
-        .phase-nav {{
-            display: flex;
-            gap: 8px;
-            align-items: center;
-        }}
-        .phase-btn {{
-            padding: 6px 12px;
-            border-radius: 20px;
-            font-size: 12px;
-            border: none;
-            cursor: pointer;
-            font-weight: 600;
-            transition: all 0.2s;
-        }}
-        .phase-btn.active {{
-            background: #238636;
-            color: white;
-        }}
-        .phase-btn.inactive {{
-            background: #21262d;
-            color: #8b949e;
-            border: 1px solid #30363d;
-        }}
-        .phase-btn.inactive:hover {{
-            background: #30363d;
-            color: #c9d1d9;
-        }}
-        .phase-btn.loading {{
-            opacity: 0.6;
-            cursor: wait;
-        }}
-        .generate-btn {{
-            padding: 10px 20px;
-            background: #238636;
-            color: white;
-            border: none;
-            border-radius: 6px;
-            cursor: pointer;
-            font-size: 14px;
-            font-weight: 600;
-        }}
-        .generate-btn:hover {{ background: #2ea043; }}
-        .generate-btn:disabled {{ 
-            background: #30363d; 
-            cursor: wait; 
-            opacity: 0.6;
-        }}
-        .output-section {{
-            margin-top: 20px;
-            padding: 15px;
-            background: #161b22;
-            border: 1px solid #30363d;
-            border-radius: 6px;
-            display: none;
-        }}
-        .output-section.visible {{ display: block; }}
-        .output-section h3 {{ color: #238636; margin-bottom: 10px; font-size: 18px; }}
-        .output-section p {{ margin: 8px 0; line-height: 1.6; }}
-        .store-badge {{
-            background: #da3633;
-            padding: 6px 12px;
-            border-radius: 20px;
-            font-size: 12px;
-            margin-left: 8px;
-        }}
-        .stats {{
-            display: flex;
-            gap: 20px;
-            margin-bottom: 15px;
-            font-size: 13px;
-        }}
-        .stat {{ color: #8b949e; }}
-        .stat strong {{ color: #58a6ff; }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            background: #161b22;
-            border-radius: 6px;
-            overflow: hidden;
-            font-size: 13px;
-        }}
-        th, td {{
-            padding: 8px 10px;
-            text-align: left;
-            border-bottom: 1px solid #21262d;
-        }}
-        th {{
-            background: #21262d;
-            color: #8b949e;
-            font-weight: 600;
-            font-size: 11px;
-            text-transform: uppercase;
-        }}
-        tr:hover {{ background: #1c2128; }}
-        tr.skipped {{ opacity: 0.4; }}
-        tr.skipped td {{ text-decoration: line-through; }}
-        tr.mapped {{ background: #0d2818; }}
-        tr.amazon {{ background: #2d1b0e; }}
-        tr.dupe {{ background: #1e1232; }}
-        .row-num {{ color: #484f58; width: 25px; }}
-        .item-name {{ font-weight: 500; max-width: 180px; word-break: break-word; }}
-        .search-link {{
-            display: inline-block;
-            padding: 4px 8px;
-            background: #388bfd;
-            color: white;
-            text-decoration: none;
-            border-radius: 4px;
-        }}
-        .search-link:hover {{ background: #58a6ff; }}
-        .url-cell {{ width: 280px; }}
-        .url-input {{
-            width: 100%;
-            padding: 6px 8px;
-            border: 1px solid #30363d;
-            border-radius: 4px;
-            font-size: 12px;
-            background: #0d1117;
-            color: #c9d1d9;
-        }}
-        .url-input:focus {{ border-color: #58a6ff; outline: none; }}
-        .url-input.filled {{ border-color: #238636; background: #0d2818; }}
-        .qty-cell {{ width: 50px; }}
-        .qty-input {{
-            width: 50px;
-            padding: 6px 4px;
-            border: 1px solid #30363d;
-            border-radius: 4px;
-            font-size: 12px;
-            background: #0d1117;
-            color: #c9d1d9;
-            text-align: center;
-        }}
-        .qty-input:focus {{ border-color: #58a6ff; outline: none; }}
-        .preview-cell {{ width: 60px; }}
-        .preview {{
-            width: 50px;
-            height: 50px;
-            background: #21262d;
-            border-radius: 4px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            overflow: hidden;
-        }}
-        .preview img {{
-            max-width: 100%;
-            max-height: 100%;
-            object-fit: contain;
-        }}
-        .actions {{
-            white-space: nowrap;
-        }}
-        .actions button {{
-            padding: 4px 6px;
-            margin: 0 2px;
-            border: none;
-            border-radius: 4px;
-            cursor: pointer;
-            font-size: 12px;
-            background: #21262d;
-        }}
-        .actions button:hover {{ background: #30363d; }}
-        .actions button.active {{ background: #388bfd; }}
-        .status-cell {{ width: 30px; font-size: 16px; text-align: center; }}
-        .action-bar {{
-            margin-top: 15px;
-            display: flex;
-            gap: 10px;
-            flex-wrap: wrap;
-            align-items: center;
-        }}
-        .submit-btn {{
-            padding: 10px 20px;
-            background: #238636;
-            color: white;
-            border: none;
-            border-radius: 6px;
-            cursor: pointer;
-            font-size: 14px;
-            font-weight: 600;
-        }}
-        .submit-btn:hover {{ background: #2ea043; }}
-        .output-section {{
-            margin-top: 15px;
-            display: none;
-        }}
-        .output-section.visible {{ display: block; }}
-        .output-section h3 {{ color: #238636; margin-bottom: 10px; font-size: 16px; }}
-        .json-output {{
-            width: 100%;
-            height: 200px;
-            background: #0d1117;
-            border: 1px solid #30363d;
-            border-radius: 6px;
-            padding: 10px;
-            font-family: 'SF Mono', Monaco, monospace;
-            font-size: 11px;
-            color: #7ee787;
-            resize: vertical;
-        }}
-        .copy-btn {{
-            margin-top: 8px;
-            padding: 8px 16px;
-            background: #da3633;
-            color: white;
-            border: none;
-            border-radius: 6px;
-            cursor: pointer;
-        }}
-        .copy-btn:hover {{ background: #f85149; }}
-        .amazon-output, .skip-output {{
-            margin-top: 10px;
-            padding: 10px;
-            background: #161b22;
-            border-radius: 6px;
-            font-size: 12px;
-        }}
-        .amazon-output h4, .skip-output h4 {{ margin: 0 0 8px 0; color: #d29922; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🛒 Product Mapping Tool</h1>
-        <div class="phase-nav">
-            <button class="phase-btn inactive" onclick="navigateToPhase1()" id="phase1-btn">
-                🧠 Phase 1: Match Existing
-            </button>
-            <button class="phase-btn active" onclick="return false;">
-                🔍 Phase 2: Hy-Vee Search
-            </button>
-            <button class="phase-btn inactive" onclick="navigateToPhase3()" id="phase3-btn">
-                🛒 Phase 3: Add to Cart
-            </button>
-        </div>
-    </div>
-    
-    <div class="stats">
-        <span class="stat">Total: <strong>{len(unmapped)}</strong></span>
-        <span class="stat">Mapped: <strong id="mapped-count">0</strong></span>
-        <span class="stat">Skipped: <strong id="skipped-count">0</strong></span>
-        <span class="stat">Amazon: <strong id="amazon-count">0</strong></span>
-        <span class="stat">Dupes: <strong id="dupe-count">0</strong></span>
-    </div>
-    
-    <table>
-        <thead>
-            <tr>
-                <th>#</th>
-                <th>Item</th>
-                <th>🔍</th>
-                <th>Product URL</th>
-                <th>Qty</th>
-                <th>Preview</th>
-                <th>Actions</th>
-                <th></th>
-            </tr>
-        </thead>
-        <tbody id="items-body">
-            {"".join(rows)}
-        </tbody>
-    </table>
-    
-    <div class="action-bar">
-        <button class="generate-btn" onclick="updateListDetails()" id="update-btn">✨ Update List Details</button>
-        <span style="color: #8b949e; font-size: 12px; margin-left: 10px;">
-            (Adds products to products.json, handles Amazon/dupes/skips, refreshes page)
-        </span>
-    </div>
-    
-    <div class="output-section" id="output-section">
-        <h3 id="output-title">⏳ Processing...</h3>
-        <div id="output-content"></div>
-    </div>
+        </tr>'''
+
+
+def _unmapped_rows(unmapped: list[dict]) -> Iterator[str]:
+    """Yield one <tr> per unmapped item for data/unmapped_items.html."""
+    row = _UNMAPPED_HTML_ROW.format_map
+    for i, item_obj in enumerate(unmapped, start=1):
+        item = item_obj.get("name") or item_obj.get("original") or item_obj.get("normalized")
+        # data-* attributes reach the JS already decoded via row.dataset, so one
+        # HTML-escaping pass covers both the cell text and the attributes.
+        yield row({
+            "num": i,
+            "item": item.translate(fuzzy_ui.HTML_ESCAPE),
+            "normalized": item_obj.get("normalized", item).translate(fuzzy_ui.HTML_ESCAPE),
+            "search_url": hyvee.build_search_url(item),
+            "quantity": item_obj.get("quantity", 1),
+        })
+
+
+def _generate_unmapped_html(unmapped: list[dict], repo_root: Path, list_name: str = "Groceries") -> Path:
+    """Generate an HTML file with clickable search links for unmapped items.
     
-    <script>
-        // Update preview when URL is pasted
-        document.querySelectorAll('.url-input').forEach(input => {{
-            input.addEventListener('input', function() {{
-                const row = this.closest('tr');
-                const preview = row.querySelector('.preview');
-                const status = row.querySelector('.status-cell');
-                const url = this.value.trim();
-                
-                if (url && url.includes('/p/')) {{
-                    this.classList.add('filled');
-                    row.dataset.status = 'mapped';
-                    row.classList.add('mapped');
-                    status.textContent = '✅';
-                    
-                    // Extract product ID and build image URL
-                    const match = url.match(/\\/p\\/(\\d+)/);
-                    if (match) {{
-                        const pid = match[1];
-                        // Hy-Vee CDN pattern
-                        const imgUrl = `https://d2d8wwwkmhfcva.cloudfront.net/100x/d2lnr5mha7bycj.cloudfront.net/product-image/file/${{pid}}.png`;
-                        preview.innerHTML = `<img src="${{imgUrl}}" onerror="this.style.display='none'" />`;
-                    }}
-                }} else {{
-                    this.classList.remove('filled');
-                    row.classList.remove('mapped');
-                    row.dataset.status = 'pending';
-                    status.textContent = '⏳';
-                    preview.innerHTML = '';
-                }}
-                updateCounts();
-            }});
-        }});
-        
-        function markSkip(btn) {{
-            const row = btn.closest('tr');
-            toggleStatus(row, 'skipped', btn);
-        }}
-        
-        function markDupe(btn) {{
-            const row = btn.closest('tr');
-            toggleStatus(row, 'dupe', btn);
-        }}
-        
-        function markAmazon(btn) {{
-            const row = btn.closest('tr');
-            toggleStatus(row, 'amazon', btn);
-        }}
-        
-        function toggleStatus(row, status, btn) {{
-            const wasActive = row.dataset.status === status;
-            
-            // Clear all statuses
-            row.classList.remove('skipped', 'dupe', 'amazon', 'mapped');
-            row.querySelectorAll('.actions button').forEach(b => b.classList.remove('active'));
-            
-            if (wasActive) {{
-                row.dataset.status = 'pending';
-                row.querySelector('.status-cell').textContent = '⏳';
-            }} else {{
-                row.dataset.status = status;
-                btn.classList.add('active');
-                row.classList.add(status);
-                const icons = {{ skipped: '⏭️', dupe: '🔁', amazon: '📦' }};
-                row.querySelector('.status-cell').textContent = icons[status];
-            }}
-            updateCounts();
-        }}
-        
-        function updateCounts() {{
-            document.getElementById('mapped-count').textContent = document.querySelectorAll('tr[data-status="mapped"]').length;
-            document.getElementById('skipped-count').textContent = document.querySelectorAll('tr[data-status="skipped"]').length;
-            document.getElementById('amazon-count').textContent = document.querySelectorAll('tr[data-status="amazon"]').length;
-            document.getElementById('dupe-count').textContent = document.querySelectorAll('tr[data-status="dupe"]').length;
-        }}
-        
-        // Update List Details - POST to backend like Phase 1
-        async function updateListDetails() {{
-            const btn = document.getElementById('update-btn');
-            btn.disabled = true;
-            btn.textContent = '⏳ Updating...';
-            
-            const rows = document.querySelectorAll('#items-body tr');
-            const products = [];
-            const amazonItems = [];
-            const dupeItems = [];
-            const skipItems = [];
-            
-            rows.forEach(row => {{
-                const itemName = row.dataset.item;
-                const status = row.dataset.status;
-                const url = row.querySelector('.url-input').value.trim();
-                const qty = parseInt(row.querySelector('.qty-input').value) || 1;
-                
-                if (status === 'amazon') {{
-                    amazonItems.push(itemName);
-                    return;
-                }}
-                if (status === 'dupe') {{
-                    dupeItems.push(itemName);
-                    return;
-                }}
-                if (status === 'skipped') {{
-                    skipItems.push(itemName);
-                    return;
-                }}
-                if (!url || !url.includes('/p/')) return;
-                
-                const match = url.match(/\\/p\\/(\\d+)/);
-                const productId = match ? match[1] : "";
-                
-                const urlParts = url.split('/');
-                let displayName = urlParts[urlParts.length - 1] || "";
-                displayName = displayName.replace(/-/g, ' ').replace(/\\?.*$/, '').trim();
-                displayName = displayName.split(' ').map(w => w.charAt(0).toUpperCase() + w.slice(1).toLowerCase()).join(' ');
-                
-                products.push({{
-                    item_name: itemName.toLowerCase(),
-                    product_id: productId,
-                    url: url.split('?')[0],
-                    display_name: displayName,
-                    quantity: qty,
-                    original_request: row.dataset.original || itemName
-                }});
-            }});
-            
-            try {{
-                const response = await fetch('http://127.0.0.1:8766/apply-phase2-mappings', {{
-                    method: 'POST',
-                    headers: {{ 'Content-Type': 'application/json' }},
-                    body: JSON.stringify({{
-                        repo_root: repoRoot,
-                        list_name: listName,
-                        products: products,
-                        amazon_items: amazonItems,
-                        dupe_items: dupeItems,
-                        skip_items: skipItems
-                    }})
-                }});
-                
-                if (!response.ok) {{
-                    throw new Error(`Server returned ${{response.status}}`);
-                }}
-                
-                const result = await response.json();
-                
-                // Show success
-                document.getElementById('output-section').classList.add('visible');
-                document.getElementById('output-title').textContent = '✅ Changes Applied Successfully!';
-                
-                let successHtml = `
-                    <div style="color: #7ee787; margin-bottom: 15px;">
-                        <p style="font-size: 15px; font-weight: 600; margin-bottom: 10px;">Summary:</p>
-                        <p>✓ Added <strong>${{products.length}}</strong> product(s) to products.json</p>
-                        ${{amazonItems.length > 0 ? `<p>✓ Moved <strong>${{amazonItems.length}}</strong> item(s) to Amazon list</p>` : ''}}
-                        ${{dupeItems.length > 0 ? `<p>✓ Removed <strong>${{dupeItems.length}}</strong> duplicate(s) from Google Tasks</p>` : ''}}
-                        ${{skipItems.length > 0 ? `<p>✓ Skipped <strong>${{skipItems.length}}</strong> item(s)</p>` : ''}}
-                    </div>
-                `;
-                
-                if (amazonItems.length > 0) {{
-                    successHtml += `
-                        <div style="margin-top: 15px; padding: 10px; background: #0d1117; border-radius: 6px;">
-                            <h4 style="color: #d29922; margin: 0 0 8px 0;">📦 Items moved to Amazon:</h4>
-                            <div style="color: #7ee787; font-size: 12px;">${{amazonItems.join('<br>')}}</div>
-                        </div>
-                    `;
-                }}
-                
-                successHtml += `
-                    <p style="color: #8b949e; font-size: 13px; margin-top: 20px;">
-                        Page will refresh automatically in 7 seconds to show updated list...
-                        <button onclick="window.location.reload();" style="background: transparent; border: 1px solid #30363d; color: #58a6ff; padding: 4px 8px; border-radius: 4px; cursor: pointer; margin-left: 10px; font-size: 12px;">Refresh Now</button>
-                    </p>
-                `;
-                
-                document.getElementById('output-content').innerHTML = successHtml;
-                
-                // Fade out mapped rows
-                rows.forEach(row => {{
-                    if (row.dataset.status === 'mapped') {{
-                        row.style.opacity = '0';
-                        row.style.transition = 'opacity 0.3s';
-                        setTimeout(() => row.style.display = 'none', 300);
-                    }}
-                }});
-                
-                // Auto-refresh
-                setTimeout(() => {{
-                    window.location.reload();
-                }}, 7000);
-                
-            }} catch (error) {{
-                document.getElementById('output-section').classList.add('visible');
-                document.getElementById('output-title').textContent = '❌ Error';
-                document.getElementById('output-content').innerHTML = `
-                    <p style="color: #f85149;">
-                        Failed to apply changes: ${{error.message}}
-                    </p>
-                `;
-            }} finally {{
-                btn.disabled = false;
-                btn.textContent = '✨ Update List Details';
-            }}
-        }}
-        
-        // Navigate to Phase 1 (Fuzzy Match)
-        function navigateToPhase1() {{
-            const btn = document.getElementById('phase1-btn');
-            if (btn.classList.contains('loading')) return;
-            
-            btn.classList.add('loading');
-            btn.textContent = '⏳ Loading...';
-            
-            // Redirect to fuzzy match UI
-            window.location.href = 'http://127.0.0.1:8766/data/fuzzy_match_items.html';
-        }}
-        
-        // Navigate to Phase 3 (Add to Cart)
-        async function navigateToPhase3() {{
-            const btn = document.getElementById('phase3-btn');
-            btn.classList.add('loading');
-            btn.textContent = '⏳ Loading...';
-            
-            // Redirect to the new dashboard
-            const params = new URLSearchParams({{
-                list_name: listName,
-                repo_root: repoRoot
-            }});
-            window.location.href = 'http://127.0.0.1:8766/phase3?' + params.toString();
-        }}
-        
-        // Store repo root and list name for navigation
-        const repoRoot = '{str(repo_root)}';
-        const listName = '{list_name}';
-    </script>
-</body>
-</html>'''
+    Args:
+        unmapped: List of dicts with keys: original (or name), normalized, quantity
+        repo_root: Repo root directory
+    """
+    output_dir = repo_root / "data"
+    output_dir.mkdir(exist_ok=True)
+    output_file = output_dir / "unmapped_items.html"
     
-    output_file.write_text(html, encoding="utf-8")
+    head, tail = _unmapped_template()
+    head = (
+        head.replace(b"__REPO_ROOT__", str(repo_root).translate(fuzzy_ui.HTML_ESCAPE).encode())
+        .replace(b"__LIST_NAME__", list_name.translate(fuzzy_ui.HTML_ESCAPE).encode())
+        .replace(b"__TOTAL__", str(len(unmapped)).encode())
+    )
+    # Write beside the target and rename into place so the server never serves a
+    # half-written page. The static halves are pre-encoded; only rows are encoded here.
+    tmp_file = output_file.with_suffix(".html.tmp")
+    with tmp_file.open("wb", buffering=1 << 16) as f:
+        f.write(head)
+        f.writelines(row.encode() for row in _unmapped_rows(unmapped))
+        f.write(tail)
+    os.replace(tmp_file, output_file)
     return output_file
+
+
+def _is_interactive() -> bool:
+    """
+    True when a person is watching stdout (not a pipe, cron job or CI).
+
+    GROCERY_INTERACTIVE=1 forces it on for runs whose stdout is piped to a UI a
+    person is watching; run_shopping() output (the server's phase 3 log) counts too.
+    """
+    if os.environ.get("GROCERY_INTERACTIVE") == "1" or getattr(_routed, "route", None) is not None:
+        return True
+    return sys.stdout.isatty() and not os.environ.get("CI")
+
+
+def _print_unmapped_list(unmapped_items: list[dict]) -> None:
+    """Plain-text fallback for non-interactive runs, where the HTML UIs are skipped."""
+    for i, item in enumerate(unmapped_items, start=1):
+        print(f"  {i}. {item['original']}")
+    print("\n(Non-interactive run: mapping UI not generated. Re-run from a terminal to map these.)")
+    print(_SEP + "\n")
+
+
+def _print_suggestions(unmapped_items: list[dict], index: library.ProductsIndex) -> None:
+    """Print a "did you mean" line for unmapped items that nearly match a product."""
+    for item in unmapped_items:
+        suggestion = index.suggest(item["normalized"])
+        if suggestion is not None:
+            print(f'  Did you mean: "{item["original"]}" -> "{suggestion}"? (confirm in the fuzzy match UI)')
+
+
+def _open_in_browser(url: str) -> None:
+    """Open url in the default browser when running interactively (no-op in CI/pipes)."""
+    if not _is_interactive():
+        return
+    import webbrowser
+
+    try:
+        webbrowser.open(url, new=2)  # new tab when a browser window is already open
+    except Exception:
+        pass  # Silently fail if no browser is available
+
+
+def _stop_browser_quietly(playwright: "Any", browser: "Any", page: "Any") -> None:
+    try:
+        hyvee.stop_browser(playwright, browser, page)
+    except Exception:
+        # Cleanup errors shouldn't mask the primary result.
+        pass
+
+
 def _dump_debug_info(page: "Any", error: Exception) -> None:
-    """Dump screenshot, HTML, and URL to /tmp/hyvee_debug/ for debugging."""
+    """Dump error, URL, HTML and (with HYVEE_DEBUG=1) a screenshot to /tmp/hyvee_debug/."""
     import traceback
-    from datetime import datetime
     
     debug_dir = Path("/tmp/hyvee_debug")
     debug_dir.mkdir(exist_ok=True)
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     
-    print(f"\n{'='*60}")
+    print("\n" + _SEP)
     print("ERROR - Dumping debug info to /tmp/hyvee_debug/")
-    print(f"{'='*60}")
+    print(_SEP)
     
-    # Dump error info
+    # Dump error info. format_exc() reads this thread's exception state, so
+    # build the text here and hand only the file writes to the worker thread.
     error_file = debug_dir / f"error_{timestamp}.txt"
-    with open(error_file, "w") as f:
-        f.write(f"Timestamp: {timestamp}\n")
-        f.write(f"Error: {error}\n\n")
-        f.write("Traceback:\n")
-        f.write(traceback.format_exc())
-    print(f"  Error: {error_file}")
-    
-    if page:
-        try:
-            # Dump URL
-            url = page.url
-            print(f"  URL: {url}")
-            
-            # Dump screenshot
-            screenshot_file = debug_dir / f"screenshot_{timestamp}.png"
-            page.screenshot(path=str(screenshot_file))
-            print(f"  Screenshot: {screenshot_file}")
-            
-            # Dump HTML
-            html_file = debug_dir / f"page_{timestamp}.html"
-            html = page.content()
-            with open(html_file, "w") as f:
-                f.write(html)
-            print(f"  HTML: {html_file}")
-            
-        except Exception as dump_err:
-            print(f"  (Could not dump page info: {dump_err})")
+    error_text = (
+        f"Timestamp: {timestamp}\n"
+        f"Error: {error}\n\n"
+        "Traceback:\n"
+        f"{traceback.format_exc()}"
+    )
+    # The sync Playwright page is bound to this thread; overlap the disk writes
+    # with the (slow) screenshot instead of running them back to back.
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        error_written = writer.submit(error_file.write_text, error_text, encoding="utf-8")
+
+        if page:
+            try:
+                # Dump URL
+                url = page.url
+                print(f"  URL: {url}")
+
+                # Grab HTML first so it is queued for writing while any screenshot renders
+                html_file = debug_dir / f"page_{timestamp}.html"
+                html_written = writer.submit(html_file.write_text, page.content(), encoding="utf-8")
+
+                # Dump screenshot (a full repaint + PNG encode): opt-in via HYVEE_DEBUG=1
+                if os.environ.get("HYVEE_DEBUG") == "1":
+                    screenshot_file = debug_dir / f"screenshot_{timestamp}.png"
+                    page.screenshot(path=str(screenshot_file))
+                    print(f"  Screenshot: {screenshot_file}")
+                else:
+                    print("  Screenshot: skipped (set HYVEE_DEBUG=1 to capture)")
+
+                html_written.result()
+                print(f"  HTML: {html_file}")
+
+            except Exception as dump_err:
+                print(f"  (Could not dump page info: {dump_err})")
+
+        error_written.result()
+        print(f"  Error: {error_file}")
     
-    print(f"{'='*60}\n")
+    print(_SEP + "\n")
 
 
 if __name__ == "__main__":
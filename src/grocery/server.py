@@ -2,23 +2,147 @@
 
 from __future__ import annotations
 
+import gzip
 import json
 import sys
-import subprocess
 import threading
 import queue
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from itertools import islice
 from pathlib import Path
 
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
+try:  # Optional speedup (pip install grocery-automation[fast]); stdlib json otherwise.
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
 # Get repo root for file serving
 REPO_ROOT = Path(__file__).resolve().parents[2]
 
+# Make the package importable when this file is run directly (python src/grocery/server.py),
+# once at import rather than per request.
+if str(REPO_ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from grocery import run  # noqa: E402
+from grocery.tools import gtasks, library  # noqa: E402
+
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """Flask's default JSON provider with orjson doing the work (same keys, same order)."""
+
+    def dumps(self, obj, **kwargs):
+        if set(kwargs) - {"indent", "separators"}:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__, static_folder=str(REPO_ROOT), static_url_path='')
+if orjson is not None:
+    # Covers jsonify() and request.get_json() in every route.
+    app.json = _OrjsonProvider(app)
 CORS(app)  # Allow cross-origin requests
 
+# Page regeneration runs off the request thread. One worker also serializes
+# writers of the shared .html.tmp / .cache state files.
+_REGEN_POOL = ThreadPoolExecutor(max_workers=1)
+
+
+def _log_regen_failure(future: Future) -> None:
+    if future.exception() is not None:
+        print(f"Background page regeneration failed: {future.exception()}")
+
+
+# Open-task/mapping state shared by the phase 2/3 routes. Clicking through the UI
+# hits several of them within seconds, so reuse one fetch + verify briefly. Keyed on
+# products.json's mtime so a new mapping is seen at once; task writes drop the entry.
+_LIST_STATE_TTL = 15
+_list_state: dict[tuple, tuple[tuple, float]] = {}
+_list_state_lock = threading.Lock()
+
+
+def _load_list_state(repo_root: Path, list_name: str, products_path: Path) -> tuple[list[dict], list[str], list[str]]:
+    """Return (normalized, mapped, unmapped) for list_name, reused for _LIST_STATE_TTL seconds."""
+    try:
+        mtime_ns = products_path.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    key = (repo_root.resolve(), list_name, mtime_ns)
+    with _list_state_lock:
+        hit = _list_state.get(key)
+    if hit is not None and time.monotonic() - hit[1] < _LIST_STATE_TTL:
+        return hit[0]
+
+    raw_titles = gtasks.fetch_open_task_titles(repo_root=repo_root, list_name=list_name)
+    normalized = gtasks.normalize(items=raw_titles)
+    mapped, unmapped = library.verify_all_mapped(products_path, [x["normalized"] for x in normalized])
+    state = (normalized, mapped, unmapped)
+    with _list_state_lock:
+        _forget_list_state_locked(repo_root, list_name)
+        _list_state[key] = (state, time.monotonic())
+    return state
+
+
+def _forget_list_state(repo_root: Path, list_name: str) -> None:
+    with _list_state_lock:
+        _forget_list_state_locked(repo_root, list_name)
+
+
+def _forget_list_state_locked(repo_root: Path, list_name: str) -> None:
+    prefix = (repo_root.resolve(), list_name)
+    for key in [k for k in _list_state if k[:2] == prefix]:
+        del _list_state[key]
+
+
+# Text responses at least this large are gzipped for clients that accept it.
+_GZIP_MIN_BYTES = 1024
+_GZIP_MIMETYPES = {"text/html", "text/css", "text/javascript", "application/javascript", "application/json"}
+
+
+@app.after_request
+def _compress_and_revalidate(response):
+    """Gzip text responses and make generated pages revalidate instead of re-download."""
+    if request.path.endswith(".html"):
+        # data/*.html is rewritten on every regeneration, so it can't get a max-age.
+        # no-cache + the ETag/Last-Modified send_file already sets turns an unchanged
+        # reload (the UI's 7s auto-refresh) into a bodiless 304.
+        response.cache_control.no_cache = True
+    if (
+        response.status_code != 200
+        or response.mimetype not in _GZIP_MIMETYPES
+        or "Content-Encoding" in response.headers
+        or "gzip" not in request.accept_encodings
+    ):
+        return response
+    response.direct_passthrough = False
+    data = response.get_data()
+    if len(data) < _GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    etag, _ = response.get_etag()
+    if etag:
+        # Same resource, different coding: weak, so If-None-Match still matches.
+        response.set_etag(etag, weak=True)
+    return response
+
 
 @app.route("/apply-mappings", methods=["POST"])
 def apply_mappings():
@@ -35,79 +159,49 @@ def apply_mappings():
     
     try:
         # Add fuzzy matches directly to products.json original_requests (single source of truth)
-        sys.path.insert(0, str(repo_root / "src"))
-        from grocery.tools import library
-        
         products_path = repo_root / "data" / "products.json"
-        variations_added = 0
-        
-        for sub in substitutions:
-            # sub["key"] = corrected name from UI (e.g., "shrimps" after editing "shrmps")
-            # sub["value"] = product key it was matched to (e.g., "frozen shrimp cocktail")
-            corrected_name = sub["key"].strip()
-            matched_product_key = sub["value"].strip()
-            
-            # Add the corrected name to the matched product's original_requests array
-            if library.add_variation_to_product(
-                products_path,
-                product_key=matched_product_key,
-                variation=corrected_name,
-            ):
-                variations_added += 1
+        # sub["key"] = corrected name from UI (e.g., "shrimps" after editing "shrmps")
+        # sub["value"] = product key it was matched to (e.g., "frozen shrimp cocktail")
+        # Add each corrected name to its matched product's original_requests array
+        # (one products.json read/write for the whole batch)
+        variations_added = library.add_variations_to_products(
+            products_path,
+            [(sub["value"].strip(), sub["key"].strip()) for sub in substitutions],
+        )
         
         results["variations_added"] = variations_added
         if variations_added > 0:
             results["message"] = f"Added {variations_added} variation(s) to products.json original_requests"
         
-        # Regenerate fuzzy HTML (so refresh shows updated list)
-        sys.path.insert(0, str(repo_root / "src"))
-        from grocery.run import regenerate_fuzzy_html
-        
-        products_path = repo_root / "data" / "products.json"
-        regenerated_html = regenerate_fuzzy_html(
-            repo_root=repo_root,
-            list_name=list_name,
-            products_path=products_path,
-        )
-        results["html_regenerated"] = regenerated_html is not None
-        if regenerated_html:
-            results["remaining_unmapped"] = "See refreshed page for updated count"
-        
         # Rename tasks in Google Tasks
         if task_renames:
-            sys.path.insert(0, str(repo_root / "src"))
-            from grocery.tools import gtasks
-            
-            service = gtasks._build_tasks_service(
-                repo_root=repo_root,
-                scopes=gtasks.DEFAULT_SCOPES_READWRITE
-            )
-            list_id = gtasks.find_task_list_id(service, "Groceries")
-            
-            if not list_id:
-                results["errors"].append("Could not find 'Groceries' task list")
-            else:
-                api_results = service.tasks().list(tasklist=list_id, showCompleted=False).execute()
-                tasks = api_results.get("items", [])
-                
-                renamed = 0
-                for rename in task_renames:
-                    for task in tasks:
-                        if task.get("title", "").strip().lower() == rename["from"].lower():
-                            task["title"] = rename["to"]
-                            service.tasks().update(tasklist=list_id, task=task["id"], body=task).execute()
-                            renamed += 1
-                            break
-                
-                results["tasks_renamed"] = renamed
+            try:
+                results["tasks_renamed"] = gtasks.rename_open_tasks_by_title(
+                    repo_root=repo_root,
+                    list_name=list_name,
+                    renames=[(rename["from"], rename["to"]) for rename in task_renames],
+                )
+            except ValueError as e:
+                results["errors"].append(str(e))
+            _forget_list_state(repo_root, list_name)
         
         # Write new items for next phase
         if new_items:
             new_items_file = repo_root / "data" / "new_items.json"
-            with open(new_items_file, "w", encoding="utf-8") as f:
-                json.dump({"items": new_items}, f, indent=2)
+            new_items_file.write_text(json.dumps({"items": new_items}, indent=2), encoding="utf-8")
             results["new_items_written"] = len(new_items)
         
+        # Regenerate fuzzy HTML (so refresh shows updated list) in the background,
+        # after the renames so the page reflects them. The client reloads after 7s;
+        # the page is swapped in atomically, so an early reload sees the old one.
+        _REGEN_POOL.submit(
+            run.regenerate_fuzzy_html,
+            repo_root=repo_root,
+            list_name=list_name,
+            products_path=products_path,
+        ).add_done_callback(_log_regen_failure)
+        results["html_regenerated"] = "pending"
+        
     except Exception as e:
         results["success"] = False
         results["errors"].append(str(e))
@@ -125,35 +219,14 @@ def proceed_to_hyvee_search():
     results = {"success": True, "errors": []}
     
     try:
-        sys.path.insert(0, str(repo_root / "src"))
-        from grocery.tools import gtasks, library
-        from grocery import run
-        
         # Re-run orchestrator logic but skip fuzzy phase
         products_path = repo_root / "data" / "products.json"
-        raw_titles = gtasks.fetch_open_task_titles(repo_root=repo_root, list_name=list_name)
-        normalized = gtasks.normalize(items=raw_titles)
-        normalized_names = [x["normalized"] for x in normalized]
-        
-        _, unmapped_names = library.verify_all_mapped(products_path, normalized_names)
+        normalized, _, unmapped_names = _load_list_state(repo_root, list_name, products_path)
         
         if unmapped_names:
-            # Build unmapped items for Hy-Vee search UI
-            # Deduplicate by normalized name, combining quantities
-            unmapped_dict = {}
-            for norm in normalized:
-                if norm["normalized"] in unmapped_names:
-                    key = norm["normalized"]
-                    if key in unmapped_dict:
-                        # Combine quantities and keep the first original name
-                        unmapped_dict[key]["quantity"] += norm["quantity"]
-                    else:
-                        unmapped_dict[key] = {
-                            "original": norm["original"],
-                            "normalized": norm["normalized"],
-                            "quantity": norm["quantity"],
-                        }
-            unmapped_items = list(unmapped_dict.values())
+            # Build unmapped items for Hy-Vee search UI: one entry per normalized
+            # name with quantities combined (single pass, set membership)
+            unmapped_items = run._build_unmapped_items(normalized, frozenset(unmapped_names))
             
             # Generate Hy-Vee search HTML
             hyvee_html = run._generate_unmapped_html(unmapped_items, repo_root, list_name=list_name)
@@ -185,40 +258,32 @@ def apply_phase2_mappings():
     results = {"success": True, "errors": []}
     
     try:
-        sys.path.insert(0, str(repo_root / "src"))
-        from grocery.tools import library, gtasks
-        from datetime import datetime
-        
         products_path = repo_root / "data" / "products.json"
-        products_added = 0
         
-        # Add products to products.json
-        for product_data in products:
-            library.add_mapping(
-                products_path,
-                item_name=product_data["item_name"],
-                product={
+        # Add products to products.json (one read and one write for the batch)
+        added = datetime.now().isoformat()
+        mappings = [
+            (
+                product_data["item_name"],
+                {
                     "product_id": product_data["product_id"],
                     "url": product_data["url"],
                     "display_name": product_data["display_name"],
-                    "added": datetime.now().isoformat(),
+                    "added": added,
                 },
-                original_request=product_data["original_request"],
+                product_data["original_request"],
             )
-            products_added += 1
+            for product_data in products
+        ]
+        products_added = library.add_mappings(products_path, mappings) if mappings else 0
         
         results["products_added"] = products_added
         
         # Handle Amazon items (move to Amazon list)
         if amazon_items:
-            service = gtasks._build_tasks_service(
-                repo_root=repo_root,
-                scopes=gtasks.DEFAULT_SCOPES_READWRITE
-            )
-            amazon_list_id = gtasks.find_task_list_id(service, "Amazon")
-            groceries_list_id = gtasks.find_task_list_id(service, list_name)
-            
-            if amazon_list_id and groceries_list_id:
+            # move_open_tasks_by_title looks up both lists on the shared, cached
+            # service and raises ValueError if either is missing.
+            try:
                 moved = gtasks.move_open_tasks_by_title(
                     repo_root=repo_root,
                     source_list_name=list_name,
@@ -226,15 +291,11 @@ def apply_phase2_mappings():
                     titles=amazon_items,
                 )
                 results["amazon_items_moved"] = moved
-            else:
-                results["errors"].append("Could not find Amazon or Groceries task list")
+            except ValueError as e:
+                results["errors"].append(str(e))
         
         # Handle duplicate items (remove from Google Tasks)
         if dupe_items:
-            service = gtasks._build_tasks_service(
-                repo_root=repo_root,
-                scopes=gtasks.DEFAULT_SCOPES_READWRITE
-            )
             removed = gtasks.mark_tasks_complete_by_title(
                 repo_root=repo_root,
                 list_name=list_name,
@@ -246,30 +307,13 @@ def apply_phase2_mappings():
         results["skip_items_count"] = len(skip_items)
         
         # Regenerate Phase 2 HTML (so refresh shows updated list)
-        from grocery.run import regenerate_fuzzy_html
-        from grocery import run as run_module
-        
-        raw_titles = gtasks.fetch_open_task_titles(repo_root=repo_root, list_name=list_name)
-        normalized = gtasks.normalize(items=raw_titles)
-        normalized_names = [x["normalized"] for x in normalized]
-        
-        _, unmapped_names = library.verify_all_mapped(products_path, normalized_names)
+        if amazon_items or dupe_items:
+            _forget_list_state(repo_root, list_name)
+        normalized, _, unmapped_names = _load_list_state(repo_root, list_name, products_path)
         
         if unmapped_names:
-            unmapped_dict = {}
-            for norm in normalized:
-                if norm["normalized"] in unmapped_names:
-                    key = norm["normalized"]
-                    if key in unmapped_dict:
-                        unmapped_dict[key]["quantity"] += norm["quantity"]
-                    else:
-                        unmapped_dict[key] = {
-                            "original": norm["original"],
-                            "normalized": norm["normalized"],
-                            "quantity": norm["quantity"],
-                        }
-            unmapped_items = list(unmapped_dict.values())
-            hyvee_html = run_module._generate_unmapped_html(unmapped_items, repo_root, list_name=list_name)
+            unmapped_items = run._build_unmapped_items(normalized, frozenset(unmapped_names))
+            hyvee_html = run._generate_unmapped_html(unmapped_items, repo_root, list_name=list_name)
             results["html_regenerated"] = True
         else:
             results["html_regenerated"] = False
@@ -293,16 +337,9 @@ def proceed_to_phase3():
     results = {"success": True, "errors": []}
     
     try:
-        sys.path.insert(0, str(repo_root / "src"))
-        from grocery.tools import gtasks, library
-        
         # Verify all items are mapped
         products_path = repo_root / "data" / "products.json"
-        raw_titles = gtasks.fetch_open_task_titles(repo_root=repo_root, list_name=list_name)
-        normalized = gtasks.normalize(items=raw_titles)
-        normalized_names = [x["normalized"] for x in normalized]
-        
-        mapped, unmapped = library.verify_all_mapped(products_path, normalized_names)
+        _, mapped, unmapped = _load_list_state(repo_root, list_name, products_path)
         
         # If unmapped items exist, we strictly fail unless the CLI args said otherwise.
         # But here we are in a server context.
@@ -334,23 +371,26 @@ def proceed_to_phase3():
         # All items mapped (or we ignored them... but we didn't implement ignore logic here fully yet).
         # Trigger the run!
         
-        cmd = [
-            sys.executable, "-m", "grocery.run",
-            "--list-name", list_name,
-            "--skip-fuzzy",
-            "--ignore-unmapped" # Safe to add this? It filters out unmapped items.
-                                # If we verified they are mapped, this flag does nothing (benign).
-                                # If they aren't mapped (and we bypassed the check above), it filters them.
-        ]
-        
-        # We need to run this in a way that shows output to the user?
-        # The user said "Check terminal".
-        # So we just spawn it.
-        
-        print(f"Server spawning command: {' '.join(cmd)}")
-        subprocess.Popen(cmd, cwd=repo_root)
+        # Run it in-process under the shared ShopperManager: one run at a time,
+        # output in the /phase3 log view (and stream), stoppable via /phase3/stop.
+        # ignore_unmapped filters out anything left unmapped; if everything is
+        # mapped it does nothing.
+        print(f"Server starting shopper for list: {list_name}")
+        started, msg = shopper.start(
+            partial(
+                run.run_shopping,
+                repo_root=repo_root,
+                list_name=list_name,
+                products_path=products_path,
+                ignore_unmapped=True,
+            )
+        )
+        if not started:
+            results["success"] = False
+            results["errors"].append(f"Shopper not started: {msg}")
+            return jsonify(results)
         
-        results["message"] = f"Started shopping for {len(mapped)} items! Check your terminal."
+        results["message"] = f"Started shopping for {len(mapped)} items! Follow progress at /phase3."
         results["mapped_count"] = len(mapped)
     
     except Exception as e:
@@ -361,69 +401,132 @@ def proceed_to_phase3():
 
 
 
+# Keep the tail of a shopper run's output; pollers only ever ask for new lines.
+_SHOPPER_LOG_LINES = 5000
+
+
 class ShopperManager:
+    """
+    Runs one grocery.run.run_shopping() at a time on a background thread and keeps
+    its output for /phase3/status and /phase3/stream.
+    """
+
     def __init__(self):
-        self.process = None
+        self.thread = None
+        self.stop_event = threading.Event()
         self.running = False
-        self.logs = []
+        self.logs = deque(maxlen=_SHOPPER_LOG_LINES)
+        self.log_offset = 0  # absolute index of logs[0] once old lines are dropped
+        self.log_lock = threading.Lock()
+        self.log_added = threading.Condition(self.log_lock)
         self.return_code = None
         self.lock = threading.Lock()
 
-    def start(self, cmd, cwd):
+    def _log(self, line):
+        with self.log_lock:
+            if len(self.logs) == self.logs.maxlen:
+                self.log_offset += 1
+            self.logs.append(line)
+            self.log_added.notify_all()
+
+    def snapshot(self, since):
+        """
+        Consistent view for status readers: (lines after absolute index since,
+        next index to ask for, running, return_code, last line or None).
+
+        Taken under both locks (same order as stop()) so a run finishing mid-read
+        can't pair new logs with a stale status.
+        """
+        with self.lock, self.log_lock:
+            start = max(0, since - self.log_offset)
+            return (
+                list(islice(self.logs, start, None)),
+                self.log_offset + len(self.logs),
+                self.running,
+                self.return_code,
+                self.logs[-1] if self.logs else None,
+            )
+
+    def wait_for_logs(self, since, timeout):
+        """Block until a line past absolute index since exists; False on timeout."""
+        with self.log_added:
+            return self.log_added.wait_for(lambda: self.log_offset + len(self.logs) > since, timeout)
+
+    def start(self, run_fn):
+        """Start run_fn(on_log=..., stop=...) -> exit code unless a run is active."""
         with self.lock:
             if self.running:
                  return False, "Process already running"
 
-            self.logs = []
+            with self.log_lock:
+                self.logs.clear()
+                self.log_offset = 0
             self.return_code = None
-            try:
-                self.process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    cwd=cwd,
-                    text=True,
-                    bufsize=1  # Line buffered
-                )
-                self.running = True
-                
-                # Start reader thread
-                threading.Thread(target=self._read_output, daemon=True).start()
-                return True, "Started"
-            except Exception as e:
-                return False, str(e)
+            self.stop_event = threading.Event()
+            self.thread = threading.Thread(target=self._run, args=(run_fn, self.stop_event), daemon=True)
+            self.running = True
+            self.thread.start()
+            return True, "Started"
 
     def stop(self):
+        """Ask the active run to end; it unwinds (closing the browser) at its next line of output."""
         with self.lock:
-            if self.process and self.running:
-                self.process.kill() # Terminate forcefully
-                self.running = False
-                self.logs.append("Process killed by user.")
+            if self.running and not self.stop_event.is_set():
+                self.stop_event.set()
+                self._log("Stop requested; ending the run at its next step.")
                 return True
             return False
 
-    def _read_output(self):
+    def _run(self, run_fn, stop_event):
+        return_code = 1
         try:
-             # Loop until process ends
-             for line in iter(self.process.stdout.readline, ''):
-                 if line:
-                     self.logs.append(line.rstrip())
-                 else:
-                     break
+            return_code = run_fn(on_log=self._log, stop=stop_event)
         except Exception as e:
-             self.logs.append(f"Error reading output: {e}")
+            self._log(f"Error running shopper: {e}")
         finally:
-             with self.lock:
-                 if self.process:
-                     self.return_code = self.process.wait()
-                 self.running = False
-                 self.logs.append(f"Process finished with code {self.return_code}")
+            with self.lock:
+                self.return_code = return_code
+                self.running = False
+                if return_code == run.STOPPED_EXIT_CODE and stop_event.is_set():
+                    self._log("Process killed by user.")
+                else:
+                    self._log(f"Process finished with code {return_code}")
 
 shopper = ShopperManager()
 
+_STATIC_DIR = REPO_ROOT / "src/grocery/static"
+# The phase 3 page only changes with the code; let the browser reuse it for an hour.
+_STATIC_MAX_AGE = 3600
+# Static file path -> (st_mtime_ns, st_size, gzipped body, etag), compressed once.
+_gzipped_static: dict[Path, tuple[int, int, bytes, str]] = {}
+
+
+def _gzipped_static_file(path: Path) -> tuple[bytes, str]:
+    """Return path's gzip-9 body and ETag, recompressing only when the file changes."""
+    st = path.stat()
+    cached = _gzipped_static.get(path)
+    if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+        body = gzip.compress(path.read_bytes(), compresslevel=9)
+        cached = (st.st_mtime_ns, st.st_size, body, f"{st.st_mtime_ns:x}-{st.st_size:x}")
+        _gzipped_static[path] = cached
+    return cached[2], cached[3]
+
+
 @app.route("/phase3")
 def phase3_ui():
-    return send_from_directory(REPO_ROOT / "src/grocery/static", "phase3.html")
+    if "gzip" in request.accept_encodings:
+        body, etag = _gzipped_static_file(_STATIC_DIR / "phase3.html")
+        response = app.response_class(body, mimetype="text/html")
+        response.headers["Content-Encoding"] = "gzip"
+        response.vary.add("Accept-Encoding")
+        response.set_etag(etag, weak=True)
+        response.make_conditional(request)
+    else:
+        response = send_from_directory(_STATIC_DIR, "phase3.html")
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = _STATIC_MAX_AGE
+    return response
 
 @app.route("/phase3/start", methods=["POST"])
 def start_shopper():
@@ -432,16 +535,9 @@ def start_shopper():
     list_name = data.get("list_name", "Groceries")
     ignore_unmapped = data.get("ignore_unmapped", False)
     
-    # -u for unbuffered output is crucial for real-time logs
-    cmd = [
-        sys.executable, "-u", "-m", "grocery.run",
-        "--list-name", list_name,
-        "--skip-fuzzy"
-    ]
-    if ignore_unmapped:
-         cmd.append("--ignore-unmapped")
-         
-    success, msg = shopper.start(cmd, cwd=repo_root)
+    success, msg = shopper.start(
+        partial(run.run_shopping, repo_root=repo_root, list_name=list_name, ignore_unmapped=ignore_unmapped)
+    )
     return jsonify({"success": success, "message": msg})
 
 @app.route("/phase3/stop", methods=["POST"])
@@ -449,29 +545,67 @@ def stop_shopper():
     success = shopper.stop()
     return jsonify({"success": success})
 
-@app.route("/phase3/status")
-def get_status():
-    since = int(request.args.get("since", 0))
-    # No lock needed for simple reading, list append is atomic-ish
-    # But technically safer with lock, but let's trust GIL for list slicing
-    new_logs = shopper.logs[since:]
+def _shopper_status(since):
+    new_logs, next_index, running, return_code, last_line = shopper.snapshot(since)
     
     status = "READY"
-    if shopper.running:
+    if running:
         status = "RUNNING"
-    elif shopper.return_code is not None:
-        status = start_shopper.return_code if False else "STOPPED" # simplified
-        status = "COMPLETED" if shopper.return_code == 0 else "ERROR"
-        if shopper.return_code != 0 and shopper.logs and "killed" in shopper.logs[-1]:
+    elif return_code is not None:
+        status = "COMPLETED" if return_code == 0 else "ERROR"
+        if return_code != 0 and last_line and "killed" in last_line:
              status = "STOPPED"
         
-    return jsonify({
+    return {
         "status": status,
         "logs": new_logs,
-        "next_index": len(shopper.logs),
-        "return_code": shopper.return_code
-    })
+        "next_index": next_index,
+        "return_code": return_code
+    }
+
+@app.route("/phase3/status")
+def get_status():
+    since = int(request.args.get("since", 0))
+    return jsonify(_shopper_status(since))
+
+# Idle streams send a comment this often so proxies and the browser keep them open.
+_STREAM_KEEPALIVE_SECONDS = 15
+
+@app.route("/phase3/stream")
+def stream_status():
+    """Server-Sent Events version of /phase3/status: one event per batch of new lines.
+
+    Each event carries the same JSON as /phase3/status and its id is next_index, so
+    an EventSource reconnect resumes via Last-Event-ID. The stream ends once the
+    shopper is no longer running.
+    """
+    since = int(request.headers.get("Last-Event-ID") or request.args.get("since", 0))
+
+    def events():
+        nonlocal since
+        while True:
+            payload = _shopper_status(since)
+            if payload["logs"] or payload["status"] != "RUNNING":
+                since = payload["next_index"]
+                yield f"id: {since}\ndata: {app.json.dumps(payload)}\n\n"
+            if payload["status"] != "RUNNING":
+                return
+            if not shopper.wait_for_logs(since, _STREAM_KEEPALIVE_SECONDS):
+                yield ": keepalive\n\n"
+
+    return Response(events(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+def main() -> None:
+    # Handlers block on Google/Hy-Vee round trips, so serve from a thread pool.
+    # waitress is optional; Werkzeug's threaded dev server is the fallback.
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host="127.0.0.1", port=8766, debug=False, threaded=True)
+    else:
+        serve(app, host="127.0.0.1", port=8766, threads=8)
+
 
 if __name__ == "__main__":
-    app.run(host="127.0.0.1", port=8766, debug=False)
+    main()
 
@@ -33,6 +33,15 @@ def unknown_item(item: str, search_url: str) -> GroceryError:
     )
 
 
+def products_file_invalid(path: str, detail: str) -> GroceryError:
+    return GroceryError(
+        code=3,
+        short="products.json could not be read",
+        context=f"{path}: {detail}",
+        next_step="Fix the JSON (or restore data/products.json.bak) then re-run",
+    )
+
+
 def add_to_cart_failed(item: str, attempts: int, url: str) -> GroceryError:
     return GroceryError(
         code=11,
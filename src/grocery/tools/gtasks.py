@@ -5,6 +5,13 @@ Auth model: OAuth desktop flow with local token storage (token.json).
 
 from __future__ import annotations
 
+import json
+import os
+import threading
+import time
+import weakref
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 import re
 from typing import Any, Optional
@@ -13,6 +20,25 @@ from typing import Any, Optional
 DEFAULT_SCOPES_READONLY = ["https://www.googleapis.com/auth/tasks.readonly"]
 DEFAULT_SCOPES_READWRITE = ["https://www.googleapis.com/auth/tasks"]
 
+# Max sub-requests per batch HTTP call.
+_BATCH_LIMIT = 100
+
+# Built services are reused per thread (httplib2 transports aren't thread-safe);
+# tokens this close to expiry are refreshed before the service is handed out.
+_service_cache = threading.local()
+_TOKEN_LEEWAY = timedelta(seconds=300)
+# Task list title -> id lookups are cached per service for this long (seconds).
+_LIST_ID_TTL = 600
+# Open-task listings used by the rename/complete/move helpers (seconds). Short:
+# it only spans back-to-back UI requests; our own writes update it in place.
+_OPEN_TASKS_TTL = 15
+
+# Incremental fetch state (see fetch_open_task_titles), relative to repo_root.
+_SYNC_CACHE_FILE = Path(".cache") / "gtasks-sync.json"
+_SYNC_OVERLAP = timedelta(minutes=5)
+# Bumped when the cached per-task shape changes; older entries get a full sync.
+_SYNC_CACHE_VERSION = 2
+
 
 def _build_tasks_service(
     *,
@@ -54,38 +80,240 @@ def _build_tasks_service(
     return build("tasks", "v1", credentials=creds)
 
 
+def get_tasks_service(*, repo_root: Path, scopes: list[str] = DEFAULT_SCOPES_READWRITE) -> Any:
+    """
+    Return a Tasks API service for repo_root, built once per thread and reused.
+
+    Saves the token.json read, discovery build and (when due) the token refresh
+    on every call after the first. If the cached token expires within
+    _TOKEN_LEEWAY it is refreshed up front and written back to token.json.
+    """
+    services = getattr(_service_cache, "services", None)
+    if services is None:
+        services = _service_cache.services = {}
+    key = (Path(repo_root), tuple(scopes))
+    service = services.get(key)
+    if service is None:
+        service = services[key] = _build_tasks_service(repo_root=repo_root, scopes=scopes)
+    else:
+        _refresh_if_expiring(service, repo_root)
+    return service
+
+
+def _refresh_if_expiring(service: Any, repo_root: Path) -> None:
+    # build(credentials=...) wraps them in an AuthorizedHttp at service._http.
+    creds = getattr(getattr(service, "_http", None), "credentials", None)
+    expiry = getattr(creds, "expiry", None)
+    if expiry is None:
+        return
+    # google-auth keeps expiry as naive UTC.
+    if expiry - datetime.now(timezone.utc).replace(tzinfo=None) > _TOKEN_LEEWAY:
+        return
+    from google.auth.transport.requests import Request
+
+    creds.refresh(Request())
+    (repo_root / "token.json").write_text(creds.to_json(), encoding="utf-8")
+
+
+def _per_service(name: str, service: Any) -> dict:
+    """This thread's cache dict `name` for service (dropped with the service)."""
+    caches = getattr(_service_cache, name, None)
+    if caches is None:
+        caches = weakref.WeakKeyDictionary()
+        setattr(_service_cache, name, caches)
+    return caches.setdefault(service, {})
+
+
 def find_task_list_id(service: Any, task_list_name: str) -> Optional[str]:
+    """
+    Return the id of the task list titled task_list_name (case-insensitive).
+
+    Found ids are cached per service for _LIST_ID_TTL seconds, so repeated calls
+    (every server request, both ends of a move) skip the tasklists().list() trip.
+    Misses are not cached: a list created meanwhile is picked up next call.
+    """
+    cached = _per_service("list_ids", service)
+    name = task_list_name.lower()
+    hit = cached.get(name)
+    if hit is not None and time.monotonic() - hit[1] < _LIST_ID_TTL:
+        return hit[0]
+
     results = service.tasklists().list().execute()
+    now = time.monotonic()
+    cached.clear()
     for task_list in results.get("items", []):
-        if task_list["title"].lower() == task_list_name.lower():
-            return task_list["id"]
-    return None
+        # First list wins on duplicate titles, as before.
+        cached.setdefault(task_list["title"].lower(), (task_list["id"], now))
+    hit = cached.get(name)
+    return hit[0] if hit is not None else None
 
 
-def fetch_open_task_titles(*, repo_root: Path, list_name: str) -> list[str]:
-    # Always use read-write scope so token stays valid for all operations
-    service = _build_tasks_service(repo_root=repo_root, scopes=DEFAULT_SCOPES_READWRITE)
-    task_list_id = find_task_list_id(service, list_name)
-    if not task_list_id:
-        raise ValueError(f"Task list not found: {list_name}")
-    
-    # Paginate through all tasks (API returns max 100 per page by default)
-    all_tasks = []
+def _execute_batched(service: Any, requests: list[Any]) -> list[Optional[Exception]]:
+    """
+    Execute API requests as batch HTTP calls (one round-trip per _BATCH_LIMIT).
+
+    Returns one entry per request: None on success, or the exception it raised.
+    Batches do not guarantee ordering, so dependent calls need separate batches.
+    """
+    errors: list[Optional[Exception]] = [None] * len(requests)
+
+    def _on_response(request_id: str, response: Any, exception: Optional[Exception]) -> None:
+        if exception is not None:
+            errors[int(request_id)] = exception
+
+    for start in range(0, len(requests), _BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=_on_response)
+        for i, req in enumerate(requests[start : start + _BATCH_LIMIT], start):
+            batch.add(req, request_id=str(i))
+        batch.execute()
+    return errors
+
+
+def _list_all_tasks(service: Any, task_list_id: str, **params: Any) -> list[dict]:
+    """tasks.list() across all pages (the API returns max 100 per page)."""
+    all_tasks: list[dict] = []
     page_token = None
     while True:
         results = service.tasks().list(
             tasklist=task_list_id,
-            showCompleted=False,
-            showHidden=False,
             maxResults=100,
             pageToken=page_token,
+            **params,
         ).execute()
         all_tasks.extend(results.get("items", []))
         page_token = results.get("nextPageToken")
         if not page_token:
             break
-    
-    return [t.get("title", "").strip() for t in all_tasks if t.get("title")]
+    return all_tasks
+
+
+def _list_open_tasks(service: Any, task_list_id: str) -> list[dict]:
+    """
+    Open tasks in a list, reused for _OPEN_TASKS_TTL seconds.
+
+    The returned list is the cached one; writers keep it current (or drop it via
+    _forget_open_tasks) so a follow-up request doesn't see stale titles.
+    """
+    cached = _per_service("open_tasks", service)
+    hit = cached.get(task_list_id)
+    if hit is not None and time.monotonic() - hit[1] < _OPEN_TASKS_TTL:
+        return hit[0]
+    tasks = _list_all_tasks(service, task_list_id, showCompleted=False, showHidden=False)
+    cached[task_list_id] = (tasks, time.monotonic())
+    return tasks
+
+
+def _forget_open_tasks(service: Any, task_list_id: str) -> None:
+    _per_service("open_tasks", service).pop(task_list_id, None)
+
+
+def _raise_first_error(service: Any, task_list_id: str, errors: list[Optional[Exception]]) -> None:
+    """Re-raise the first failed write, dropping the list's cached open tasks first."""
+    for err in errors:
+        if err is not None:
+            _forget_open_tasks(service, task_list_id)
+            raise err
+
+
+def _load_sync_cache(path: Path) -> dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_sync_cache(path: Path, cache: dict[str, Any]) -> None:
+    # Best-effort: a failed write only means the next run does a full fetch.
+    # Write a sibling temp file and swap it in, so a crash mid-write leaves the
+    # previous cache intact instead of a truncated one.
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(cache), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _cached_task(task: dict) -> dict[str, Any]:
+    return {
+        "title": task.get("title", "").strip(),
+        "position": task.get("position", ""),
+        "parent": task.get("parent"),
+    }
+
+
+def _titles_in_list_order(open_tasks: dict[str, dict]) -> list[str]:
+    """
+    Titles ordered as the list shows them: by `position`, subtasks right after
+    their parent. Delta merges append to the dict, so its order can't be trusted.
+    """
+
+    def sort_key(task: dict) -> tuple[str, bool, str]:
+        parent = open_tasks.get(task["parent"]) if task["parent"] else None
+        if parent is None:
+            return (task["position"], False, "")
+        return (parent["position"], True, task["position"])
+
+    return [t["title"] for t in sorted(open_tasks.values(), key=sort_key) if t["title"]]
+
+
+def fetch_open_task_titles(*, repo_root: Path, list_name: str, full_sync: bool = False) -> list[str]:
+    """
+    Return the titles of all open tasks in `list_name`.
+
+    Open tasks are cached in <repo_root>/.cache/gtasks-sync.json. Later calls only
+    ask the API for tasks updated since the previous sync (updatedMin) and merge
+    them in; completed/deleted tasks in that delta drop out of the cache.
+    full_sync=True ignores the cache and lists every open task again.
+    Titles come back in list order (task `position`), however they were fetched.
+    """
+    # Always use read-write scope so token stays valid for all operations
+    service = get_tasks_service(repo_root=repo_root)
+    task_list_id = find_task_list_id(service, list_name)
+    if not task_list_id:
+        raise ValueError(f"Task list not found: {list_name}")
+
+    cache_path = repo_root / _SYNC_CACHE_FILE
+    cache = _load_sync_cache(cache_path)
+    entry = cache.get(list_name)
+    # Server-side `updated` stamps can trail our clock; overlap syncs a little.
+    synced_at = (datetime.now(timezone.utc) - _SYNC_OVERLAP).isoformat(timespec="seconds")
+
+    if (
+        full_sync
+        or not entry
+        or entry.get("list_id") != task_list_id
+        or entry.get("version") != _SYNC_CACHE_VERSION
+    ):
+        all_tasks = _list_all_tasks(service, task_list_id, showCompleted=False, showHidden=False)
+        # Real tasks always carry an id; fall back to the listing index so nothing
+        # the API returned is dropped.
+        open_tasks = {t.get("id") or f"#{i}": _cached_task(t) for i, t in enumerate(all_tasks)}
+    else:
+        open_tasks = dict(entry.get("tasks", {}))
+        changed = _list_all_tasks(
+            service,
+            task_list_id,
+            showCompleted=True,
+            showHidden=True,
+            showDeleted=True,
+            updatedMin=entry["synced_at"],
+        )
+        for task in changed:
+            if task.get("deleted") or task.get("status") == "completed":
+                open_tasks.pop(task["id"], None)
+            else:
+                open_tasks[task["id"]] = _cached_task(task)
+
+    cache[list_name] = {
+        "version": _SYNC_CACHE_VERSION,
+        "list_id": task_list_id,
+        "synced_at": synced_at,
+        "tasks": open_tasks,
+    }
+    _save_sync_cache(cache_path, cache)
+    return _titles_in_list_order(open_tasks)
 
 
 def mark_tasks_complete_by_title(
@@ -94,26 +322,72 @@ def mark_tasks_complete_by_title(
     list_name: str,
     titles: list[str],
 ) -> int:
-    service = _build_tasks_service(repo_root=repo_root, scopes=DEFAULT_SCOPES_READWRITE)
+    service = get_tasks_service(repo_root=repo_root)
     task_list_id = find_task_list_id(service, list_name)
     if not task_list_id:
         raise ValueError(f"Task list not found: {list_name}")
 
     # Fetch open tasks once, then complete matches.
-    results = service.tasks().list(tasklist=task_list_id, showCompleted=False, showHidden=False).execute()
-    tasks = results.get("items", [])
+    tasks = _list_open_tasks(service, task_list_id)
 
     target = {t.lower().strip() for t in titles}
-    completed = 0
+    completed = []
+    updates = []
     for task in tasks:
         title = task.get("title", "")
         if title.lower().strip() not in target:
             continue
-        task["status"] = "completed"
-        service.tasks().update(tasklist=task_list_id, task=task["id"], body=task).execute()
-        completed += 1
+        # PATCH with just the changed field; update() would PUT the whole task back.
+        completed.append(task["id"])
+        updates.append(
+            service.tasks().patch(tasklist=task_list_id, task=task["id"], body={"status": "completed"})
+        )
 
-    return completed
+    errors = _execute_batched(service, updates)
+    _raise_first_error(service, task_list_id, errors)
+    done = set(completed)
+    tasks[:] = [task for task in tasks if task.get("id") not in done]
+    return len(updates)
+
+
+def rename_open_tasks_by_title(
+    *,
+    repo_root: Path,
+    list_name: str,
+    renames: list[tuple[str, str]],
+) -> int:
+    """
+    Retitle open tasks: each (old, new) pair renames the first open task whose
+    title matches `old` (case-insensitive). Updates are sent as batch HTTP requests.
+    """
+    service = get_tasks_service(repo_root=repo_root)
+    task_list_id = find_task_list_id(service, list_name)
+    if not task_list_id:
+        raise ValueError(f"Task list not found: {list_name}")
+
+    tasks = _list_open_tasks(service, task_list_id)
+
+    # Index open tasks by matching key once; each rename takes the first task left
+    # under its key, so a repeated rename moves on to the next same-titled task.
+    by_title: dict[str, list[dict]] = {}
+    for task in tasks:
+        by_title.setdefault(task.get("title", "").strip().lower(), []).append(task)
+
+    renamed: list[tuple[dict, str]] = []
+    updates = []
+    for old, new in renames:
+        matches = by_title.get(old.lower())
+        if not matches:
+            continue
+        task = matches.pop(0)
+        renamed.append((task, new))
+        updates.append(service.tasks().patch(tasklist=task_list_id, task=task["id"], body={"title": new}))
+
+    errors = _execute_batched(service, updates)
+    _raise_first_error(service, task_list_id, errors)
+    for task, new in renamed:
+        task["title"] = new
+    return len(updates)
 
 
 def move_open_tasks_by_title(
@@ -130,8 +404,10 @@ def move_open_tasks_by_title(
     - list open tasks in the source list
     - insert new tasks in the destination list with the same title (and notes if present)
     - delete the original tasks from the source list
+
+    Inserts and deletes are each sent as batch HTTP requests.
     """
-    service = _build_tasks_service(repo_root=repo_root, scopes=DEFAULT_SCOPES_READWRITE)
+    service = get_tasks_service(repo_root=repo_root)
 
     source_id = find_task_list_id(service, source_list_name)
     if not source_id:
@@ -144,10 +420,10 @@ def move_open_tasks_by_title(
     if not wanted:
         return 0
 
-    results = service.tasks().list(tasklist=source_id, showCompleted=False, showHidden=False).execute()
-    tasks = results.get("items", [])
+    tasks = _list_open_tasks(service, source_id)
 
-    moved = 0
+    matches = []
+    inserts = []
     for task in tasks:
         title = (task.get("title") or "").strip()
         if not title:
@@ -160,11 +436,21 @@ def move_open_tasks_by_title(
         if notes:
             body["notes"] = notes
 
-        service.tasks().insert(tasklist=dest_id, body=body).execute()
-        service.tasks().delete(tasklist=source_id, task=task["id"]).execute()
-        moved += 1
+        matches.append(task)
+        inserts.append(service.tasks().insert(tasklist=dest_id, body=body))
 
-    return moved
+    # Only delete originals whose copy landed in the destination list.
+    insert_errors = _execute_batched(service, inserts)
+    copied = [task for task, err in zip(matches, insert_errors) if err is None]
+    delete_errors = _execute_batched(
+        service,
+        [service.tasks().delete(tasklist=source_id, task=task["id"]) for task in copied],
+    )
+    _forget_open_tasks(service, dest_id)
+    _raise_first_error(service, source_id, [*insert_errors, *delete_errors])
+    moved = {task["id"] for task in copied}
+    tasks[:] = [task for task in tasks if task.get("id") not in moved]
+    return len(copied)
 
 
 _LEADING_QTY_RE = re.compile(r"^\s*(\d+)\s+(.*)$")
@@ -185,6 +471,13 @@ def normalize(*, items: list[str]) -> list[dict]:
     
     Product matching is handled by products.json lookup (checks original_requests arrays).
     """
+    # Phase 1 and every regenerate pass normalize the same titles; the result is
+    # cached and copied out so callers can still mutate their dicts.
+    return [dict(x) for x in _normalize_cached(tuple(items))]
+
+
+@lru_cache(maxsize=32)
+def _normalize_cached(items: tuple[str, ...]) -> tuple[dict, ...]:
     out: list[dict] = []
     for raw in items:
         if raw is None:
@@ -212,7 +505,7 @@ def normalize(*, items: list[str]) -> list[dict]:
         normalized = s.lower().strip()
         out.append({"original": original, "normalized": normalized, "quantity": qty})
 
-    return out
+    return tuple(out)
 
 
 
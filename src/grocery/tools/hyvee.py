@@ -1,17 +1,36 @@
 """Hy-Vee browser automation tools.
 
-Playwright is a hard dependency for this project. We import it normally and
-fail fast if it isn't installed.
+Playwright is a hard dependency for this project, but it is imported inside the
+functions that launch a browser so that importing this module (and the
+orchestrator's --dry-run / task-only paths) stays fast. A missing install
+still fails as soon as a browser is requested.
 """
 
 from __future__ import annotations
 
+import json
 import os
+import re
+import signal
+import string
+import subprocess
 import time
+import weakref
 from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
 
-from playwright.sync_api import sync_playwright
+
+# Product pages are /aisles-online/p/<id>/<slug>. Ids are usually numeric, but
+# the capture takes the whole segment so older non-numeric ids still parse.
+_PRODUCT_ID_RE = re.compile(r"/p/([^/]+)")
+# Cart page fallbacks: product links in raw HTML, and the order-summary total
+# ("Estimated Total $164.52" or "Estimated Total\n$164.52").
+_CART_PRODUCT_HREF_RE = re.compile(r'href=["\'](?:https://www.hy-vee.com)?/aisles-online/p/(\d+)/')
+_ESTIMATED_TOTAL_RE = re.compile(r"Estimated Total.*?\$([\d,]+\.\d{2})", re.DOTALL)
+# Cart audit tokenizer: punctuation -> spaces.
+_PUNCTUATION_TO_SPACE = str.maketrans(string.punctuation, " " * len(string.punctuation))
 
 
 @dataclass(frozen=True)
@@ -23,6 +42,7 @@ class ProductCandidate:
     add_button_label: str
 
 
+@lru_cache(maxsize=512)
 def build_search_url(query: str) -> str:
     return f"https://www.hy-vee.com/aisles-online/search?search={query.replace(' ', '+')}"
 
@@ -51,41 +71,91 @@ def _dismiss_popups(page: Any) -> None:
         pass
 
 
-def start_browser(*, headless: bool = False, persistent: bool = True) -> tuple[Any, Any, Any]:
+_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+_LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-web-security",
+    "--disable-features=IsolateOrigins,site-per-process",
+]
+
+_STATE_DIR = Path.home() / ".grocery-automation"
+# Cookies/localStorage saved after login, preloaded into non-persistent contexts.
+# Holds a live session, so it is written owner-only (0o600).
+_STORAGE_STATE_FILE = _STATE_DIR / "hyvee-storage-state.json"
+# Non-persistent contexts from start_browser() -> the state file they preloaded.
+# Only these get their login saved; persistent profiles keep cookies themselves.
+_storage_state_targets: weakref.WeakKeyDictionary[Any, Path] = weakref.WeakKeyDictionary()
+
+# Long-lived Chromium for --daemon runs. It gets its own profile because Chromium
+# refuses to open one user-data-dir from two processes at once.
+_DAEMON_STATE_FILE = _STATE_DIR / "browser-daemon.json"
+# The DevTools (CDP) endpoint is unauthenticated: any local process that can reach
+# it can drive the logged-in session. It is bound to loopback only; override the
+# port with HYVEE_DAEMON_PORT.
+_DAEMON_HOST = "127.0.0.1"
+_DAEMON_PORT = 9333
+
+
+def _daemon_port() -> int:
+    value = os.environ.get("HYVEE_DAEMON_PORT")
+    if not value:
+        return _DAEMON_PORT
+    try:
+        port = int(value)
+    except ValueError:
+        port = 0
+    if not 1 <= port <= 65535:
+        raise RuntimeError(f"HYVEE_DAEMON_PORT must be a TCP port number, got {value!r}")
+    return port
+
+
+def _apply_stealth(page: Any) -> None:
+    from playwright_stealth import Stealth
+
+    # Apply stealth patches to avoid bot detection
+    stealth = Stealth(
+        navigator_platform_override="MacIntel",
+        navigator_vendor_override="Google Inc.",
+    )
+    stealth.apply_stealth_sync(page)
+
+
+def start_browser(
+    *,
+    headless: bool = False,
+    persistent: bool = True,
+    storage_state_path: Path | None = None,
+) -> tuple[Any, Any, Any]:
     """Return (playwright, browser, page).
     
     Args:
         headless: Run browser without GUI
         persistent: Use persistent context to preserve cookies/login state
+        storage_state_path: Non-persistent only; cookies saved by ensure_logged_in()
+            to preload (defaults to ~/.grocery-automation/hyvee-storage-state.json)
     """
-    from pathlib import Path
-    from playwright_stealth import Stealth
-    
+    from playwright.sync_api import sync_playwright
+
     playwright = sync_playwright().start()
     
     # User data directory for persistent sessions (preserves login cookies)
     user_data_dir = Path.home() / ".grocery-automation" / "browser-data"
     user_data_dir.mkdir(parents=True, exist_ok=True)
     
-    launch_args = [
-        "--disable-blink-features=AutomationControlled",
-        "--disable-dev-shm-usage",
-        "--no-sandbox",
-        "--disable-web-security",
-        "--disable-features=IsolateOrigins,site-per-process",
-    ]
-    
     if persistent:
         # Persistent context preserves cookies between sessions
         context = playwright.chromium.launch_persistent_context(
             str(user_data_dir),
             headless=headless,
-            args=launch_args,
-            user_agent=(
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
+            args=_LAUNCH_ARGS,
+            user_agent=_USER_AGENT,
             viewport={"width": 1920, "height": 1080},
             locale="en-US",
             timezone_id="America/Chicago",
@@ -95,31 +165,129 @@ def start_browser(*, headless: bool = False, persistent: bool = True) -> tuple[A
     else:
         browser = playwright.chromium.launch(
             headless=headless,
-            args=launch_args,
+            args=_LAUNCH_ARGS,
         )
+        state_file = storage_state_path or _STORAGE_STATE_FILE
         context = browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
+            storage_state=str(state_file) if state_file.exists() else None,
+            user_agent=_USER_AGENT,
             viewport={"width": 1920, "height": 1080},
             locale="en-US",
             timezone_id="America/Chicago",
         )
+        _storage_state_targets[context] = state_file
         page = context.new_page()
     
-    # Apply stealth patches to avoid bot detection
-    stealth = Stealth(
-        navigator_platform_override="MacIntel",
-        navigator_vendor_override="Google Inc.",
-    )
-    stealth.apply_stealth_sync(page)
+    _apply_stealth(page)
     
     page.set_default_timeout(30000)
     return playwright, browser, page
 
 
+def _daemon_endpoint() -> str | None:
+    """Return the CDP endpoint of a live browser daemon, or None."""
+    import urllib.request
+
+    try:
+        state = json.loads(_DAEMON_STATE_FILE.read_text(encoding="utf-8"))
+        os.kill(state["pid"], 0)
+        with urllib.request.urlopen(f"{state['endpoint']}/json/version", timeout=1):
+            pass
+        return state["endpoint"]
+    except Exception:
+        return None
+
+
+def _launch_daemon(playwright: Any, *, headless: bool) -> str:
+    """Spawn a detached Chromium with remote debugging enabled; return its endpoint."""
+    import urllib.request
+
+    user_data_dir = _STATE_DIR / "browser-daemon-data"
+    user_data_dir.mkdir(parents=True, exist_ok=True)
+    port = _daemon_port()
+    endpoint = f"http://{_DAEMON_HOST}:{port}"
+
+    cmd = [
+        playwright.chromium.executable_path,
+        f"--remote-debugging-address={_DAEMON_HOST}",
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={user_data_dir}",
+        f"--user-agent={_USER_AGENT}",
+        "--window-size=1920,1080",
+        "--lang=en-US",
+        "--no-first-run",
+        "--no-default-browser-check",
+        *_LAUNCH_ARGS,
+    ]
+    if headless:
+        cmd.append("--headless=new")
+    # New session so the browser outlives this process (and its Ctrl-C).
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{endpoint}/json/version", timeout=1):
+                break
+        except Exception:
+            if proc.poll() is not None:
+                raise RuntimeError(f"Browser daemon exited during startup (code {proc.returncode})")
+            time.sleep(0.2)
+    else:
+        proc.kill()
+        raise RuntimeError(f"Browser daemon did not open {endpoint} within 15s")
+
+    _DAEMON_STATE_FILE.write_text(json.dumps({"pid": proc.pid, "endpoint": endpoint}), encoding="utf-8")
+    return endpoint
+
+
+def attach_daemon_browser(*, headless: bool = False) -> tuple[Any, Any, Any]:
+    """Return (playwright, browser, page) attached to a long-lived browser daemon.
+
+    The first call launches a detached Chromium and records its CDP endpoint;
+    later calls reconnect to it, skipping browser start-up entirely. Each run gets
+    a fresh page in the daemon's default context, so login cookies carry over.
+    stop_browser() only disconnects; use stop_daemon_browser() to shut it down.
+    """
+    from playwright.sync_api import sync_playwright
+
+    playwright = sync_playwright().start()
+    try:
+        endpoint = _daemon_endpoint() or _launch_daemon(playwright, headless=headless)
+        browser = playwright.chromium.connect_over_cdp(endpoint)
+        context = browser.contexts[0] if browser.contexts else browser.new_context(user_agent=_USER_AGENT)
+        page = context.new_page()
+    except Exception:
+        playwright.stop()
+        raise
+
+    _apply_stealth(page)
+
+    page.set_default_timeout(30000)
+    return playwright, browser, page
+
+
+def stop_daemon_browser() -> bool:
+    """Terminate the browser daemon if one is running. Returns True if one was stopped."""
+    # Only signal a pid that still answers on its CDP endpoint; after a reboot or
+    # crash the recorded pid may belong to an unrelated process.
+    if _daemon_endpoint() is None:
+        _DAEMON_STATE_FILE.unlink(missing_ok=True)
+        return False
+    try:
+        state = json.loads(_DAEMON_STATE_FILE.read_text(encoding="utf-8"))
+        os.kill(state["pid"], signal.SIGTERM)
+    except (OSError, ValueError, KeyError):
+        return False
+    _DAEMON_STATE_FILE.unlink(missing_ok=True)
+    return True
+
+
 def stop_browser(playwright: Any, browser: Any, page: Any) -> None:
     """Gracefully stop the browser."""
     if page:
@@ -131,6 +299,7 @@ def stop_browser(playwright: Any, browser: Any, page: Any) -> None:
     if browser:
         try:
             # For persistent context, this closes the browser process
+            # (for a daemon attached over CDP it only disconnects)
             time.sleep(0.5) # Allow page close to settle
             browser.close() 
         except:
@@ -143,6 +312,26 @@ def stop_browser(playwright: Any, browser: Any, page: Any) -> None:
             pass
 
 
+def _save_storage_state(page: Any) -> None:
+    """Save the login for the next non-persistent run; no-op for other contexts."""
+    state_file = _storage_state_targets.get(page.context)
+    if state_file is None:
+        return
+    # Best-effort; a missing state file only costs a login on the next run.
+    tmp_file = state_file.with_name(state_file.name + ".tmp")
+    try:
+        state = page.context.storage_state()
+        state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file.unlink(missing_ok=True)
+        # Created 0o600 from the start (never briefly readable), then swapped in.
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(state))
+        os.replace(tmp_file, state_file)
+    except Exception:
+        pass
+
+
 def ensure_logged_in(page: Any, *, email: str | None = None, password: str | None = None) -> None:
     """Navigate to Hy-Vee and log in if needed (best-effort)."""
     email = email or os.getenv("HYVEE_EMAIL")
@@ -215,6 +404,7 @@ def ensure_logged_in(page: Any, *, email: str | None = None, password: str | Non
             if login_btn.count() == 0 or account_btn.count() > 0:
                 print("  Login confirmed.")
                 time.sleep(2) # Let cookies settle
+                _save_storage_state(page)
                 _dismiss_popups(page)
                 return
 
@@ -269,9 +459,7 @@ def search(page: Any, *, query: str, limit: int = 5) -> list[ProductCandidate]:
             except Exception:
                 url = ""
 
-            product_id = ""
-            if url and "/p/" in url:
-                product_id = url.split("/p/")[-1].split("/")[0]
+            product_id = extract_product_id(url) or ""
 
             results.append(
                 ProductCandidate(
@@ -396,16 +584,10 @@ def extract_product_id(url: str) -> str | None:
     Example: https://www.hy-vee.com/aisles-online/p/3304437/HyVee-Tartar-Sauce
     Returns: 3304437
     """
-    if not url or "/p/" not in url:
+    if not url:
         return None
-    try:
-        # Split by /p/ and take the next segment
-        parts = url.split("/p/")
-        if len(parts) > 1:
-            return parts[1].split("/")[0]
-    except Exception:
-        pass
-    return None
+    match = _PRODUCT_ID_RE.search(url)
+    return match.group(1) if match else None
 
 
 def get_cart_product_ids(page: Any) -> set[str]:
@@ -436,11 +618,10 @@ def get_cart_product_ids(page: Any) -> set[str]:
             time.sleep(1)
             
         # Get raw content and regex it - robust against shadow DOM / visibility quirks
-        import re
         html = page.content()
         # Find all href="/aisles-online/p/123456/..." patterns
-        # Adjust regex to match observed URL structure: /aisles-online/p/ID/Slug OR https://www.hy-vee.com/aisles-online/p/ID/Slug
-        matches = re.finditer(r'href=["\'](?:https://www.hy-vee.com)?/aisles-online/p/(\d+)/', html)
+        # (relative, or absolute on https://www.hy-vee.com)
+        matches = _CART_PRODUCT_HREF_RE.finditer(html)
         
         ids = set()
         for m in matches:
@@ -485,6 +666,7 @@ def ensure_items_in_cart(
 
     data = library.load_products(products_path)
     products = data.get("products", {}) or {}
+    index = library.ProductsIndex(products)
 
     # Get initial cart count
     initial_count = get_cart_count(page)
@@ -536,7 +718,7 @@ def ensure_items_in_cart(
             norm_name = library.normalize_key(item)
             orig_name = item
 
-        resolved = library.resolve_product(products, norm_name)
+        resolved = library.resolve_product(products, norm_name, index=index)
         mapping = resolved[1] if resolved else None
 
         if not mapping:
@@ -570,7 +752,7 @@ def ensure_items_in_cart(
             norm_name = library.normalize_key(item)
             orig_name = item
 
-        resolved = library.resolve_product(products, norm_name)
+        resolved = library.resolve_product(products, norm_name, index=index)
         if not resolved:
             print(f"  ⚠️ Warning: Skipping unknown item '{orig_name}' (Normalized: '{norm_name}'). Not mapped in products.json.")
             continue
@@ -646,10 +828,8 @@ def ensure_items_in_cart(
         
         # Helper to normalize string into set of tokens
         def get_tokens(s: str) -> set[str]:
-            import string
             # Remove punctuation, lower case, split by whitespace
-            clean = s.lower().translate(str.maketrans(string.punctuation, ' '*len(string.punctuation)))
-            return set(clean.split())
+            return set(s.lower().translate(_PUNCTUATION_TO_SPACE).split())
 
         # Build list of expected token sets
         expected_token_sets = []
@@ -659,7 +839,7 @@ def ensure_items_in_cart(
             else:
                 norm = library.normalize_key(item)
             
-            resolved = library.resolve_product(products, norm)
+            resolved = library.resolve_product(products, norm, index=index)
             if resolved:
                 name_to_use = resolved[1].get("display_name", "")
             else:
@@ -710,25 +890,26 @@ def ensure_items_in_cart(
         summary_section = page.locator('section:has-text("Order Summary")').first
         if summary_section.count() > 0:
             text = summary_section.inner_text()
-            # Parse "Estimated Total $164.52" or "Estimated Total\n$164.52"
-            import re
-            match = re.search(r'Estimated Total.*?\$([\d,]+\.\d{2})', text, re.DOTALL)
+            match = _ESTIMATED_TOTAL_RE.search(text)
             if match:
                 total_price = f"${match.group(1)}"
     except Exception:
         pass
 
-    print(f"  [OK] Final Cart Count: {get_cart_count(page)}")
+    final_count = get_cart_count(page)
+    print(f"  [OK] Final Cart Count: {final_count}")
     print(f"  [OK] Estimated Total: {total_price}")
     print("  ----------------------")
     
     # Send System Notification
     try:
-        import subprocess
         msg = f"Cart complete. {final_count} items. Total: {total_price}."
-        subprocess.run([
-            "osascript", "-e", 
-            f'display notification "{msg}" with title "Grocery Automation"'
-        ])
+        # Fire and forget: nothing here needs osascript's exit status.
+        subprocess.Popen(
+            ["osascript", "-e", f'display notification "{msg}" with title "Grocery Automation"'],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
     except Exception:
         pass
@@ -7,21 +7,154 @@ human-auditable state that supports idempotent runs.
 from __future__ import annotations
 
 import json
+import os
+import re
+import threading
 from datetime import datetime
 from difflib import get_close_matches
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
+
+try:  # Optional speedup (pip install grocery-automation[fast]); stdlib json otherwise.
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+# Both accept the raw file bytes, so there is no separate UTF-8 decode pass.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+# Parsed JSON keyed by path -> (st_mtime_ns, st_size, data). Read-only callers
+# share the cached object; writers go through load_products() for a fresh copy.
+_json_cache: dict[Path, tuple[int, int, Any]] = {}
+_index_cache: dict[Path, "ProductsIndex"] = {}
+
+# One lock per products file so concurrent read-modify-write callers (server
+# request threads) cannot drop each other's updates. Reentrant so save_products()
+# can take it inside add_mappings()/add_variations_to_products().
+_products_locks: dict[Path, threading.RLock] = {}
+_products_locks_guard = threading.Lock()
+
+
+def _products_lock(path: Path) -> threading.RLock:
+    key = Path(path).resolve()
+    with _products_locks_guard:
+        lock = _products_locks.get(key)
+        if lock is None:
+            lock = _products_locks[key] = threading.RLock()
+        return lock
 
 
 def normalize_key(text: str) -> str:
     return text.strip().lower()
 
 
+def _empty_products() -> dict[str, Any]:
+    return {"products": {}, "version": "1.0", "last_updated": None, "notes": ""}
+
+
+def _load_json_cached(path: Path) -> Any:
+    """Parse a JSON file, reusing the previous parse while (mtime, size) are unchanged."""
+    st = os.stat(path)
+    cached = _json_cache.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    data = _json_loads(path.read_bytes())
+    _json_cache[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
+def _load_products_cached(path: Path) -> dict[str, Any]:
+    """Read-only view of products.json. Callers must not mutate the result."""
+    if not path.exists():
+        return _empty_products()
+    return _load_json_cached(path)
+
+
+_DOUBLED_LETTER_RE = re.compile(r"([a-z])\1+")
+# "/" and "." stay: dropping them would turn "1/2 gallon" into "12 gallon".
+_TOKEN_JUNK_RE = re.compile(r"[^a-z0-9%/.]")
+
+
+def _loose_key(text: str) -> str:
+    """
+    Spelling- and word-order-insensitive key for near-duplicate names.
+
+    Tokens are sorted, stripped of apostrophes and other punctuation (except "/" and
+    ".") and have doubled letters collapsed, so "milk 2% gallon" ~ "2% milk gallon"
+    and "mayonaise" ~ "mayonnaise". Digits are left alone ("100" must not become "10").
+    Too loose to map on ("milk chocolate" ~ "chocolate milk"): only used for suggest().
+    """
+    tokens = (_DOUBLED_LETTER_RE.sub(r"\1", _TOKEN_JUNK_RE.sub("", t)) for t in text.split())
+    return " ".join(sorted(t for t in tokens if t))
+
+
+class ProductsIndex:
+    """
+    Hash index from every product key and original_requests alias to its product key.
+
+    Built once per products dict so each lookup is a single dict probe instead of a
+    scan over every product's original_requests. resolve() is exact-only; names that
+    only differ from a known key/alias in word order, punctuation or doubled letters
+    are offered by suggest() (see _loose_key) for a human to confirm.
+    """
+
+    def __init__(self, products: dict[str, Any]) -> None:
+        self.products = products
+        aliases: dict[str, str] = {}
+        for key, product_data in products.items():
+            for req in product_data.get("original_requests", []):
+                # First product wins, matching the old scan order.
+                aliases.setdefault(normalize_key(req), key)
+        # Direct key matches take precedence over aliases.
+        aliases.update((key, key) for key in products)
+        self._aliases = aliases
+        # Every exact (normalized) name that maps to a product. A set-like view,
+        # so callers can intersect/difference against it without copying.
+        self.names = aliases.keys()
+        # Built on the first suggest(); all-mapped runs never pay for it.
+        self._loose: dict[str, str] | None = None
+
+    def _loose_index(self) -> dict[str, str]:
+        if self._loose is None:
+            loose: dict[str, str] = {}
+            for key in self.products:
+                loose.setdefault(_loose_key(key), key)
+            for alias, key in self._aliases.items():
+                loose.setdefault(_loose_key(alias), key)
+            self._loose = loose
+        return self._loose
+
+    def resolve(self, item_name: str) -> str | None:
+        """Return the product key for item_name (exact key/alias match), or None if unmapped."""
+        return self._aliases.get(normalize_key(item_name))
+
+    def suggest(self, item_name: str) -> str | None:
+        """
+        Return a "did you mean" product key for an unmapped item_name, or None.
+
+        Never used to treat an item as mapped: callers show it for confirmation.
+        """
+        normalized = normalize_key(item_name)
+        if normalized in self._aliases:
+            return None
+        return self._loose_index().get(_loose_key(normalized))
+
+
+def load_products_index(products_path: Path) -> ProductsIndex:
+    """Return a ProductsIndex for products.json, cached until the file changes."""
+    products = _load_products_cached(products_path).get("products", {})
+    index = _index_cache.get(products_path)
+    if index is None or index.products is not products:
+        index = ProductsIndex(products)
+        _index_cache[products_path] = index
+    return index
+
+
 def load_products(path: Path) -> dict[str, Any]:
     if not path.exists():
-        return {"products": {}, "version": "1.0", "last_updated": None, "notes": ""}
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+        return _empty_products()
+    return _json_loads(path.read_bytes())
 
 
 def save_products(path: Path, data: dict[str, Any]) -> None:
@@ -29,8 +162,13 @@ def save_products(path: Path, data: dict[str, Any]) -> None:
     data.setdefault("version", "1.0")
     data["last_updated"] = datetime.now().isoformat()
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    # Serialize once and write once; json.dump() would call f.write per token.
+    # Write a sibling and swap it in so concurrent readers never see a partial file.
+    tmp_path = path.with_name(path.name + ".tmp")
+    with _products_lock(path):
+        tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+        _json_cache.pop(path, None)
 
 
 def lookup(products_path: Path, item_name: str) -> dict[str, Any] | None:
@@ -40,46 +178,30 @@ def lookup(products_path: Path, item_name: str) -> dict[str, Any] | None:
     First checks product keys, then searches original_requests arrays.
     This allows matching variations like "shrmps" → "shrimps" product.
     """
-    data = load_products(products_path)
-    products = data.get("products", {})
-    normalized = normalize_key(item_name)
-    
-    # First check direct key match
-    if normalized in products:
-        return products[normalized]
-    
-    # Then search original_requests arrays
-    for product_key, product_data in products.items():
-        original_requests = product_data.get("original_requests", [])
-        if normalized in [normalize_key(req) for req in original_requests]:
-            return product_data
-    
-    return None
+    index = load_products_index(products_path)
+    key = index.resolve(item_name)
+    return index.products[key] if key is not None else None
 
 
-def resolve_product(products: dict[str, Any], item_name: str) -> tuple[str, dict[str, Any]] | None:
+def resolve_product(
+    products: dict[str, Any],
+    item_name: str,
+    *,
+    index: ProductsIndex | None = None,
+) -> tuple[str, dict[str, Any]] | None:
     """
     Resolve a product from the loaded products dictionary.
     Returns (product_key, product_data) or None.
     
-    Checks direct key and original_requests aliases.
+    Checks direct key and original_requests aliases. Pass a prebuilt `index`
+    when resolving many items against the same products dict.
     """
-    normalized = normalize_key(item_name)
-    
-    # 1. Direct Key Match
-    if normalized in products:
-        return normalized, products[normalized]
-    
-    # 2. Alias Match (original_requests)
-    for key, data in products.items():
-        aliases = data.get("original_requests", [])
-        # Optimization: Normalize aliases once? No, dictionary is robust.
-        # We process one item at a time, this loop is fast enough for <1000 items.
-        for req in aliases:
-            if normalize_key(req) == normalized:
-                return key, data
-                
-    return None
+    if index is None:
+        index = ProductsIndex(products)
+    key = index.resolve(item_name)
+    if key is None:
+        return None
+    return key, products[key]
 
 
 def add_mapping(
@@ -95,30 +217,52 @@ def add_mapping(
     - product: dict containing at least display_name/url/product_id (optional)
     - original_request: appended into product.original_requests
     """
-    key = normalize_key(item_name)
-    data = load_products(products_path)
-    products = data.setdefault("products", {})
-
-    existing = products.get(key)
-    if existing is None:
-        merged = dict(product)
-        merged.setdefault("original_requests", [])
-        if original_request:
-            merged["original_requests"] = list(
-                dict.fromkeys([*merged.get("original_requests", []), original_request])
-            )
-        merged.setdefault("added", datetime.now().isoformat())
-        products[key] = merged
-    else:
-        existing.update(product)
-        if original_request:
-            reqs = existing.get("original_requests", [])
-            if original_request not in reqs:
-                reqs.append(original_request)
-            existing["original_requests"] = reqs
-        products[key] = existing
-
-    save_products(products_path, data)
+    add_mappings(products_path, [(item_name, product, original_request)])
+
+
+def add_mappings(
+    products_path: Path,
+    mappings: Iterable[tuple[str, dict[str, Any], str | None]],
+) -> int:
+    """
+    Bulk add_mapping: one products.json read and one write.
+
+    Args:
+        products_path: Path to products.json
+        mappings: (item_name, product, original_request) triples, applied in order
+
+    Returns:
+        Number of mappings applied
+    """
+    with _products_lock(products_path):
+        data = load_products(products_path)
+        products = data.setdefault("products", {})
+
+        applied = 0
+        for item_name, product, original_request in mappings:
+            key = normalize_key(item_name)
+            existing = products.get(key)
+            if existing is None:
+                merged = dict(product)
+                merged.setdefault("original_requests", [])
+                if original_request:
+                    merged["original_requests"] = list(
+                        dict.fromkeys([*merged.get("original_requests", []), original_request])
+                    )
+                merged.setdefault("added", datetime.now().isoformat())
+                products[key] = merged
+            else:
+                existing.update(product)
+                if original_request:
+                    reqs = existing.get("original_requests", [])
+                    if original_request not in reqs:
+                        reqs.append(original_request)
+                    existing["original_requests"] = reqs
+                products[key] = existing
+            applied += 1
+
+        save_products(products_path, data)
+    return applied
 
 
 def add_variation_to_product(
@@ -138,84 +282,103 @@ def add_variation_to_product(
     Returns:
         True if added, False if product not found
     """
-    data = load_products(products_path)
-    products = data.get("products", {})
-    
-    normalized_key = normalize_key(product_key)
-    if normalized_key not in products:
-        return False
-    
-    product = products[normalized_key]
-    original_requests = product.setdefault("original_requests", [])
+    return add_variations_to_products(products_path, [(product_key, variation)]) == 1
+
+
+def add_variations_to_products(
+    products_path: Path,
+    variations: Iterable[tuple[str, str]],
+) -> int:
+    """
+    Bulk add_variation_to_product: one products.json read and at most one write.
     
-    normalized_variation = normalize_key(variation)
-    # Add if not already present (case-insensitive)
-    if normalized_variation not in [normalize_key(req) for req in original_requests]:
-        original_requests.append(variation)  # Keep original case for display
-        product["original_requests"] = original_requests
-        products[normalized_key] = product
-        save_products(products_path, data)
+    Args:
+        products_path: Path to products.json
+        variations: (product_key, variation) pairs, applied in order
     
-    return True
+    Returns:
+        Number of pairs whose product exists (already-present variations count too)
+    """
+    with _products_lock(products_path):
+        data = load_products(products_path)
+        products = data.get("products", {})
+
+        found = 0
+        changed = False
+        for product_key, variation in variations:
+            normalized_key = normalize_key(product_key)
+            if normalized_key not in products:
+                continue
+            found += 1
+
+            product = products[normalized_key]
+            original_requests = product.setdefault("original_requests", [])
 
+            normalized_variation = normalize_key(variation)
+            # Add if not already present (case-insensitive)
+            if normalized_variation not in [normalize_key(req) for req in original_requests]:
+                original_requests.append(variation)  # Keep original case for display
+                changed = True
 
-def verify_all_mapped(products_path: Path, items: list[str]) -> tuple[list[str], list[str]]:
+        if changed:
+            save_products(products_path, data)
+    return found
+
+
+def verify_all_mapped(
+    products_path: Path | ProductsIndex,
+    items: Iterable[str],
+) -> tuple[list[str], list[str]]:
     """
     Return (mapped, unmapped) based on keys OR original_requests in products.json.
     
     Checks both product keys and original_requests arrays to handle variations.
+    Matching is exact (after strip/lowercase): near misses that ProductsIndex.suggest()
+    would offer stay unmapped so they go through the mapping UI.
+    Pass an already-built ProductsIndex instead of a path to skip the file check.
+    items may be any iterable (e.g. a generator over normalize() output); it is
+    consumed in a single pass.
     """
-    data = load_products(products_path)
-    products = data.get("products", {})
+    index = products_path if isinstance(products_path, ProductsIndex) else load_products_index(products_path)
+    names = index.names
     mapped: list[str] = []
     unmapped: list[str] = []
     
     for item in items:
-        normalized = normalize_key(item)
-        
-        # Check direct key match
-        if normalized in products:
+        # normalize() output is already stripped/lowercased, so most items hit the
+        # exact-name set; only misses pay for normalize_key.
+        if item in names or normalize_key(item) in names:
             mapped.append(item)
-            continue
-        
-        # Check original_requests arrays
-        found = False
-        for product_data in products.values():
-            original_requests = product_data.get("original_requests", [])
-            if normalized in [normalize_key(req) for req in original_requests]:
-                mapped.append(item)
-                found = True
-                break
-        
-        if not found:
+        else:
             unmapped.append(item)
     
     return mapped, unmapped
 
 
-def fuzzy_match_products(products_path: Path, item: str, n: int = 3, cutoff: float = 0.6) -> list[tuple[str, float]]:
+def fuzzy_match_products(
+    products_path: Path | ProductsIndex,
+    item: str,
+    n: int = 3,
+    cutoff: float = 0.6,
+) -> list[tuple[str, float]]:
     """
     Return top N fuzzy matches for an unmapped item.
     
     Searches both product keys AND original_requests arrays for better matching.
     Returns list of (product_key, similarity_score) tuples, sorted by score descending.
     Uses difflib.get_close_matches with configurable cutoff (default 0.6 = 60% similarity).
+    A near-duplicate from ProductsIndex.suggest() (word order, punctuation, doubled
+    letters) is always listed first, whatever its difflib score.
+    Pass an already-built ProductsIndex to match many items against one parse.
     """
-    data = load_products(products_path)
-    products = data.get("products", {})
-    if not products:
+    index = products_path if isinstance(products_path, ProductsIndex) else load_products_index(products_path)
+    if not index.products:
         return []
     
     normalized_item = normalize_key(item)
     
-    # Build search space: product keys + all original_requests
-    search_space = set(products.keys())
-    for product_data in products.values():
-        original_requests = product_data.get("original_requests", [])
-        for req in original_requests:
-            search_space.add(normalize_key(req))
-    
-    all_keys = list(search_space)
+    # Search space: product keys + all original_requests (the index's exact names)
+    all_keys = index.names
     
     # get_close_matches returns sorted by similarity
     matches = get_close_matches(normalized_item, all_keys, n=n, cutoff=cutoff)
@@ -226,17 +389,8 @@ def fuzzy_match_products(products_path: Path, item: str, n: int = 3, cutoff: flo
     seen_products = set()
     
     for match in matches:
-        # Find which product this match belongs to
-        product_key = None
-        if match in products:
-            product_key = match
-        else:
-            # Match came from original_requests, find the product
-            for key, product_data in products.items():
-                original_requests = product_data.get("original_requests", [])
-                if match in [normalize_key(req) for req in original_requests]:
-                    product_key = key
-                    break
+        # Find which product this match belongs to (key or original_requests alias)
+        product_key = index.resolve(match)
         
         if product_key and product_key not in seen_products:
             score = SequenceMatcher(None, normalized_item, match).ratio()
@@ -245,6 +399,11 @@ def fuzzy_match_products(products_path: Path, item: str, n: int = 3, cutoff: flo
     
     # Sort by score descending
     results.sort(key=lambda x: x[1], reverse=True)
+    
+    suggestion = index.suggest(normalized_item)
+    if suggestion is not None:
+        results = [r for r in results if r[0] != suggestion]
+        results.insert(0, (suggestion, SequenceMatcher(None, normalized_item, suggestion).ratio()))
     return results[:n]
 
 
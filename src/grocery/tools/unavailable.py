@@ -8,6 +8,13 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Literal, Optional
 
+try:  # Optional speedup, same as library.
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 Reason = Literal["not_found", "out_of_stock", "discontinued", "unknown"]
 
@@ -23,8 +30,7 @@ class UnavailableItem:
 def load_unavailable(path: Path) -> dict[str, Any]:
     if not path.exists():
         return {"items": []}
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return _json_loads(path.read_bytes())
 
 
 def append_unavailable(
@@ -45,7 +51,6 @@ def append_unavailable(
         }
     )
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
 
 
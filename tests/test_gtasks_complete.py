@@ -14,10 +14,10 @@ class _FakeTasks:
         assert "tasklist" in kwargs
         return self
 
-    def update(self, *, tasklist: str, task: str, body: dict):
+    def patch(self, *, tasklist: str, task: str, body: dict):
         assert tasklist
         assert task
-        assert body.get("status") == "completed"
+        assert body == {"status": "completed"}
         self.updated.append((tasklist, task))
         return self
 
@@ -50,10 +50,31 @@ class _FakeTaskLists:
         return {"items": self._items}
 
 
+class _FakeBatch:
+    def __init__(self, callback):
+        self._callback = callback
+        self._requests: list[tuple[str, object]] = []
+
+    def add(self, request, request_id=None):
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        # Like the real BatchHttpRequest: a failed request is reported to the
+        # callback rather than raised.
+        for request_id, request in self._requests:
+            try:
+                response, err = request.execute(), None
+            except Exception as e:
+                response, err = None, e
+            self._callback(request_id, response, err)
+
+
 class _FakeService:
     def __init__(self, tasklists, tasks: _FakeTasks):
         self._tasklists = _FakeTaskLists(tasklists)
         self._tasks = tasks
+        self.batches = 0
+        self.created: list[_FakeBatch] = []
 
     def tasklists(self):
         return self._tasklists
@@ -61,6 +82,11 @@ class _FakeService:
     def tasks(self):
         return self._tasks
 
+    def new_batch_http_request(self, callback=None):
+        self.batches += 1
+        self.created.append(_FakeBatch(callback))
+        return self.created[-1]
+
 
 def test_mark_tasks_complete_by_title_marks_matching_titles_case_insensitive(monkeypatch, tmp_path: Path):
     from grocery.tools import gtasks
@@ -89,6 +115,7 @@ def test_mark_tasks_complete_by_title_marks_matching_titles_case_insensitive(mon
     )
     assert count == 2
     assert fake_tasks.updated == [("g", "1"), ("g", "3")]
+    assert fake_service.batches == 1
 
 
 def test_mark_tasks_complete_by_title_missing_list(monkeypatch, tmp_path: Path):
@@ -138,3 +165,66 @@ def test_move_open_tasks_by_title_inserts_into_dest_and_deletes_from_source(monk
     assert fake_tasks.deleted == [("g", "1")]
 
 
+def test_rename_open_tasks_by_title_batches_first_match_per_rename(monkeypatch, tmp_path: Path):
+    from grocery.tools import gtasks
+
+    class _RenameTasks(_FakeTasks):
+        def patch(self, *, tasklist: str, task: str, body: dict):
+            self.updated.append((task, body["title"]))
+            return self
+
+    fake_tasks = _RenameTasks(items=[{"id": "1", "title": "Shrmps"}, {"id": "2", "title": "shrmps"}])
+    fake_service = _FakeService(tasklists=[{"title": "Groceries", "id": "g"}], tasks=fake_tasks)
+    monkeypatch.setattr(gtasks, "_build_tasks_service", lambda **kwargs: fake_service)
+
+    renamed = gtasks.rename_open_tasks_by_title(
+        repo_root=tmp_path, list_name="Groceries", renames=[("shrmps", "shrimp"), ("nope", "x"), ("SHRMPS", "shrimp")]
+    )
+    assert renamed == 2
+    assert fake_tasks.updated == [("1", "shrimp"), ("2", "shrimp")]
+    assert fake_service.batches == 1
+
+
+def test_open_task_listing_is_reused_and_kept_current_by_writes(monkeypatch, tmp_path: Path):
+    from grocery.tools import gtasks
+
+    class _CountingTasks(_FakeTasks):
+        listed = 0
+
+        def list(self, **kwargs):
+            self.listed += 1
+            return super().list(**kwargs)
+
+        def patch(self, *, tasklist: str, task: str, body: dict):
+            self.updated.append((task, body))
+            return self
+
+    fake_tasks = _CountingTasks(items=[{"id": "1", "title": "shrmps"}, {"id": "2", "title": "Milk"}])
+    fake_service = _FakeService(tasklists=[{"title": "Groceries", "id": "g"}], tasks=fake_tasks)
+    monkeypatch.setattr(gtasks, "_build_tasks_service", lambda **kwargs: fake_service)
+
+    gtasks.rename_open_tasks_by_title(repo_root=tmp_path, list_name="Groceries", renames=[("shrmps", "shrimp")])
+    # The second call sees the renamed title without listing again.
+    assert gtasks.mark_tasks_complete_by_title(repo_root=tmp_path, list_name="Groceries", titles=["shrimp"]) == 1
+    assert gtasks.mark_tasks_complete_by_title(repo_root=tmp_path, list_name="Groceries", titles=["shrimp"]) == 0
+    assert fake_tasks.listed == 1
+
+
+def test_execute_batched_chunks_and_collects_errors():
+    from grocery.tools import gtasks
+
+    class _Request:
+        def __init__(self, fail: bool):
+            self.fail = fail
+
+        def execute(self):
+            if self.fail:
+                raise RuntimeError("boom")
+            return {}
+
+    service = _FakeService(tasklists=[], tasks=_FakeTasks(items=[]))
+    requests = [_Request(fail=(i == 120)) for i in range(150)]
+    errors = gtasks._execute_batched(service, requests)
+
+    assert [len(b._requests) for b in service.created] == [100, 50]
+    assert [i for i, e in enumerate(errors) if e is not None] == [120]
@@ -80,3 +80,109 @@ def test_fetch_open_task_titles_missing_list(monkeypatch, tmp_path: Path):
         gtasks.fetch_open_task_titles(repo_root=tmp_path, list_name="Groceries")
 
 
+def test_fetch_open_task_titles_incremental_sync(monkeypatch, tmp_path: Path):
+    from grocery.tools import gtasks
+
+    class _RecordingTasks:
+        def __init__(self):
+            self.calls: list[dict] = []
+
+        def list(self, **kwargs):
+            self.calls.append(kwargs)
+            return self
+
+        def execute(self):
+            if "updatedMin" not in self.calls[-1]:
+                return {"items": [{"id": "1", "title": "milk"}, {"id": "2", "title": "bread"}]}
+            return {
+                "items": [
+                    {"id": "2", "title": "bread", "status": "completed"},
+                    {"id": "3", "title": "eggs", "status": "needsAction"},
+                ]
+            }
+
+    tasks = _RecordingTasks()
+    fake = _FakeService(tasklists=[{"title": "Groceries", "id": "g"}], tasks=[])
+    fake._tasks = tasks
+    monkeypatch.setattr(gtasks, "_build_tasks_service", lambda **kwargs: fake)
+
+    assert gtasks.fetch_open_task_titles(repo_root=tmp_path, list_name="Groceries") == ["milk", "bread"]
+    assert gtasks.fetch_open_task_titles(repo_root=tmp_path, list_name="Groceries") == ["milk", "eggs"]
+    assert "updatedMin" in tasks.calls[-1] and tasks.calls[-1]["showDeleted"] is True
+
+    gtasks.fetch_open_task_titles(repo_root=tmp_path, list_name="Groceries", full_sync=True)
+    assert "updatedMin" not in tasks.calls[-1]
+
+
+def test_get_tasks_service_reuses_service_per_repo_root(monkeypatch, tmp_path: Path):
+    from grocery.tools import gtasks
+
+    built = []
+
+    def _fake_build(*, repo_root: Path, scopes: list[str]):
+        built.append(repo_root)
+        return object()
+
+    monkeypatch.setattr(gtasks, "_build_tasks_service", _fake_build)
+
+    first = gtasks.get_tasks_service(repo_root=tmp_path)
+    assert gtasks.get_tasks_service(repo_root=tmp_path) is first
+    assert built == [tmp_path]
+
+
+def test_find_task_list_id_caches_hits_but_not_misses():
+    from grocery.tools import gtasks
+
+    fake = _FakeService(tasklists=[{"title": "Groceries", "id": "g"}], tasks=[])
+    listed = []
+    fake._tasklists.execute = lambda: listed.append(1) or {"items": fake._tasklists._items}
+
+    assert gtasks.find_task_list_id(fake, "Groceries") == "g"
+    assert gtasks.find_task_list_id(fake, "groceries") == "g"
+    assert len(listed) == 1
+
+    assert gtasks.find_task_list_id(fake, "Amazon") is None
+    assert gtasks.find_task_list_id(fake, "Amazon") is None
+    assert len(listed) == 3
+
+
+def test_fetch_open_task_titles_keeps_list_order_across_delta_syncs(monkeypatch, tmp_path: Path):
+    from grocery.tools import gtasks
+
+    class _PositionedTasks:
+        def __init__(self):
+            self.calls: list[dict] = []
+
+        def list(self, **kwargs):
+            self.calls.append(kwargs)
+            return self
+
+        def execute(self):
+            if "updatedMin" not in self.calls[-1]:
+                return {
+                    "items": [
+                        {"id": "b", "title": "bread", "position": "00000000000000000002"},
+                        {"id": "m", "title": "milk", "position": "00000000000000000001"},
+                    ]
+                }
+            # Delta: eggs added at the top, plus a subtask under milk.
+            return {
+                "items": [
+                    {"id": "e", "title": "eggs", "position": "00000000000000000000"},
+                    {"id": "s", "title": "skim", "position": "00000000000000000000", "parent": "m"},
+                ]
+            }
+
+    fake = _FakeService(tasklists=[{"title": "Groceries", "id": "g"}], tasks=[])
+    fake._tasks = _PositionedTasks()
+    monkeypatch.setattr(gtasks, "_build_tasks_service", lambda **kwargs: fake)
+
+    assert gtasks.fetch_open_task_titles(repo_root=tmp_path, list_name="Groceries") == ["milk", "bread"]
+    assert gtasks.fetch_open_task_titles(repo_root=tmp_path, list_name="Groceries") == [
+        "eggs",
+        "milk",
+        "skim",
+        "bread",
+    ]
+    # The cache is swapped in whole; no temp file is left behind.
+    assert sorted(p.name for p in (tmp_path / ".cache").iterdir()) == ["gtasks-sync.json"]
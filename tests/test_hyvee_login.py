@@ -107,3 +107,42 @@ def test_ensure_logged_in_attempts_login_flow_with_creds(monkeypatch):
     assert any(c[0] == "fill" and c[2] == "pw" for c in page.calls)
 
 
+
+
+def test_storage_state_saved_owner_only_for_non_persistent_contexts(tmp_path):
+    from grocery.tools import hyvee
+
+    class _Context:
+        def storage_state(self):
+            return {"cookies": [{"name": "session"}], "origins": []}
+
+    class _Page:
+        def __init__(self):
+            self.context = _Context()
+
+    # Persistent profile (not registered by start_browser): nothing is written.
+    hyvee._save_storage_state(_Page())
+    assert list(tmp_path.iterdir()) == []
+
+    page = _Page()
+    state_file = tmp_path / "state" / "hyvee-storage-state.json"
+    hyvee._storage_state_targets[page.context] = state_file
+    hyvee._save_storage_state(page)
+
+    assert state_file.read_text(encoding="utf-8") == '{"cookies": [{"name": "session"}], "origins": []}'
+    assert state_file.stat().st_mode & 0o777 == 0o600
+
+
+def test_stop_daemon_browser_only_removes_stale_state(tmp_path, monkeypatch):
+    from grocery.tools import hyvee
+
+    state_file = tmp_path / "browser-daemon.json"
+    state_file.write_text('{"pid": 4242, "endpoint": "http://127.0.0.1:9333"}', encoding="utf-8")
+    killed = []
+    monkeypatch.setattr(hyvee, "_DAEMON_STATE_FILE", state_file)
+    monkeypatch.setattr(hyvee, "_daemon_endpoint", lambda: None)
+    monkeypatch.setattr(hyvee.os, "kill", lambda pid, sig: killed.append(pid))
+
+    assert hyvee.stop_daemon_browser() is False
+    assert killed == []
+    assert not state_file.exists()
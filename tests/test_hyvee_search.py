@@ -118,3 +118,20 @@ def test_search_parses_add_to_cart_labels_and_urls():
     assert results[1].url == "https://www.hy-vee.com/aisles-online/p/9999/other"
 
 
+
+
+def test_extract_product_id_parses_every_stored_product_url():
+    import json
+    from pathlib import Path
+
+    from grocery.tools.hyvee import extract_product_id
+
+    products_path = Path(__file__).resolve().parents[1] / "data" / "products.json"
+    products = json.loads(products_path.read_text())["products"]
+    for name, entry in products.items():
+        if entry.get("url"):
+            assert (extract_product_id(entry["url"]) or "") == entry["product_id"], name
+
+    # Non-numeric ids are captured whole, as the old split("/p/") parser did.
+    assert extract_product_id("https://www.hy-vee.com/aisles-online/p/abc-123/Thing") == "abc-123"
+    assert extract_product_id("https://www.hy-vee.com/aisles-online/browse") is None
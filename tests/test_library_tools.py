@@ -39,4 +39,178 @@ def test_verify_all_mapped_partitions(tmp_path: Path):
     assert mapped == ["milk"]
     assert unmapped == ["bread"]
 
+    # Any iterable works, including a one-shot generator.
+    assert library.verify_all_mapped(products_path, (x for x in ["bread", "milk"])) == (["milk"], ["bread"])
 
+    # A prebuilt index can stand in for the path.
+    index = library.load_products_index(products_path)
+    assert library.verify_all_mapped(index, ["milk", "bread"]) == (["milk"], ["bread"])
+
+
+def test_verify_all_mapped_sees_mappings_added_after_cached_read(tmp_path: Path):
+    from grocery.tools import library
+
+    products_path = tmp_path / "products.json"
+    library.add_mapping(products_path, item_name="milk", product={"display_name": "Milk"})
+    assert library.verify_all_mapped(products_path, ["bread"]) == ([], ["bread"])
+
+    library.add_mapping(products_path, item_name="bread", product={"display_name": "Bread"})
+    assert library.verify_all_mapped(products_path, ["bread"]) == (["bread"], [])
+
+
+def test_resolve_product_matches_key_before_alias():
+    from grocery.tools import library
+
+    products = {
+        "shrimp": {"original_requests": ["prawns"]},
+        "prawns": {"original_requests": []},
+        "cocktail sauce": {"original_requests": ["Shrimp Sauce", "prawns"]},
+    }
+    index = library.ProductsIndex(products)
+    assert library.resolve_product(products, "Prawns", index=index)[0] == "prawns"
+    assert library.resolve_product(products, " shrimp sauce ", index=index)[0] == "cocktail sauce"
+    assert library.resolve_product(products, "lobster", index=index) is None
+
+
+def test_verify_all_mapped_only_counts_exact_names(tmp_path: Path):
+    from grocery.tools import library
+
+    products_path = tmp_path / "products.json"
+    library.add_mapping(
+        products_path,
+        item_name="2% milk gallon",
+        product={"display_name": "Hy-Vee 2% Milk"},
+    )
+
+    # A reordered name is only a suggestion; it must still go through the mapping UI.
+    mapped, unmapped = library.verify_all_mapped(products_path, ["2% milk gallon", "milk 2% gallon"])
+    assert mapped == ["2% milk gallon"]
+    assert unmapped == ["milk 2% gallon"]
+    assert library.load_products_index(products_path).suggest("milk 2% gallon") == "2% milk gallon"
+
+
+def test_suggest_offers_misspellings_but_resolve_does_not():
+    from grocery.tools import library
+
+    products = {"mayonnaise": {"original_requests": ["Hellmann's mayo"]}}
+    index = library.ProductsIndex(products)
+    assert library.resolve_product(products, "mayonaise", index=index) is None
+    assert index.suggest("mayonaise") == "mayonnaise"
+    assert index.suggest("hellmans mayo") == "mayonnaise"
+    assert index.suggest("mayo") is None
+    # Exact matches need no suggestion.
+    assert index.suggest("Mayonnaise") is None
+
+
+def test_word_order_swap_is_never_resolved():
+    from grocery.tools import library
+
+    products = {"chocolate milk": {"original_requests": []}}
+    index = library.ProductsIndex(products)
+    assert index.resolve("milk chocolate") is None
+    assert library.resolve_product(products, "milk chocolate", index=index) is None
+    assert library.verify_all_mapped(index, ["milk chocolate"]) == ([], ["milk chocolate"])
+    # Offered for confirmation only, ahead of the difflib matches.
+    assert index.suggest("milk chocolate") == "chocolate milk"
+    assert library.fuzzy_match_products(index, "milk chocolate")[0][0] == "chocolate milk"
+
+
+def test_punctuation_in_quantities_is_kept():
+    from grocery.tools import library
+
+    index = library.ProductsIndex({"12 gallon milk": {"original_requests": []}})
+    assert index.resolve("1/2 gallon milk") is None
+    assert index.suggest("1/2 gallon milk") is None
+
+
+def test_products_index_skips_loose_index_until_suggest():
+    from grocery.tools import library
+
+    index = library.ProductsIndex({"milk": {"original_requests": ["whole milk"]}})
+    assert index.resolve("Whole Milk") == "milk"
+    assert index.resolve("milk whole") is None
+    assert index._loose is None
+    assert index.suggest("milk whole") == "milk"
+    assert index._loose is not None
+
+
+def test_fuzzy_match_products_accepts_index():
+    from grocery.tools import library
+
+    index = library.ProductsIndex(
+        {"whole milk": {"original_requests": ["milk gallon"]}, "bread": {"original_requests": []}}
+    )
+    matches = library.fuzzy_match_products(index, "milk galon", n=3, cutoff=0.5)
+    assert [key for key, _ in matches] == ["whole milk"]
+
+
+def test_add_variations_to_products_writes_once(monkeypatch, tmp_path: Path):
+    from grocery.tools import library
+
+    products_path = tmp_path / "products.json"
+    library.add_mapping(products_path, item_name="shrimp", product={"display_name": "Shrimp"})
+
+    saves = []
+    real_save = library.save_products
+    monkeypatch.setattr(library, "save_products", lambda *a: saves.append(1) or real_save(*a))
+
+    found = library.add_variations_to_products(
+        products_path, [("shrimp", "shrmps"), ("Shrimp", "SHRMPS"), ("nope", "x"), ("shrimp", "shrimps")]
+    )
+    assert found == 3
+    assert len(saves) == 1
+    assert library.lookup(products_path, "shrimp")["original_requests"] == ["shrmps", "shrimps"]
+
+
+def test_add_mappings_writes_once(tmp_path: Path, monkeypatch):
+    from grocery.tools import library
+
+    products_path = tmp_path / "products.json"
+    library.save_products(products_path, {"products": {"milk": {"display_name": "Milk", "original_requests": ["milk"]}}})
+
+    saves = []
+    real_save = library.save_products
+    monkeypatch.setattr(library, "save_products", lambda path, data: (saves.append(path), real_save(path, data)))
+
+    applied = library.add_mappings(
+        products_path,
+        [("Milk", {"url": "u1"}, "whole milk"), ("eggs", {"display_name": "Eggs"}, "eggs")],
+    )
+    assert applied == 2
+    assert len(saves) == 1
+
+    data = library.load_products(products_path)["products"]
+    assert data["milk"]["url"] == "u1"
+    assert data["milk"]["original_requests"] == ["milk", "whole milk"]
+    assert data["eggs"]["original_requests"] == ["eggs"]
+
+
+def test_concurrent_add_mappings_keep_every_update(tmp_path: Path, monkeypatch):
+    import threading
+    import time
+
+    from grocery.tools import library
+
+    products_path = tmp_path / "products.json"
+    library.save_products(products_path, {"products": {}})
+
+    real_load = library.load_products
+
+    def slow_load(path):
+        data = real_load(path)
+        time.sleep(0.05)  # widen the read-modify-write window
+        return data
+
+    monkeypatch.setattr(library, "load_products", slow_load)
+
+    threads = [
+        threading.Thread(target=library.add_mappings, args=(products_path, [(name, {"display_name": name}, None)]))
+        for name in ("milk", "eggs", "bread")
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(real_load(products_path)["products"]) == ["bread", "eggs", "milk"]
+    assert not (tmp_path / "products.json.tmp").exists()
@@ -36,3 +36,99 @@ def test_run_shows_fuzzy_ui_on_unmapped_items(monkeypatch, tmp_path: Path, capsy
     assert "unmapped item" in out.lower()
 
 
+def test_run_reports_corrupt_products_json(monkeypatch, tmp_path: Path, capsys):
+    (tmp_path / "data").mkdir()
+    products_path = tmp_path / "data" / "products.json"
+    products_path.write_text("{not json", encoding="utf-8")
+
+    from grocery import run
+
+    monkeypatch.setattr(run.gtasks, "fetch_open_task_titles", lambda **kwargs: ["milk"])
+    monkeypatch.setattr(
+        "sys.argv",
+        ["grocery-run", "--list-name", "Groceries", "--repo-root", str(tmp_path), "--products", str(products_path)],
+        raising=False,
+    )
+
+    assert run.main() == 3
+    assert "ERROR [3]" in capsys.readouterr().out
+
+
+def test_regenerate_fuzzy_html_skips_render_when_inputs_unchanged(monkeypatch, tmp_path: Path):
+    (tmp_path / "data").mkdir()
+    products_path = tmp_path / "data" / "products.json"
+    products_path.write_text(json.dumps({"products": {}}), encoding="utf-8")
+
+    from grocery import run
+
+    rendered = []
+    real_generate = run.fuzzy_ui.generate_fuzzy_match_html
+
+    def _counting_generate(*args, **kwargs):
+        rendered.append(args[0])
+        return real_generate(*args, **kwargs)
+
+    monkeypatch.setattr(run.gtasks, "fetch_open_task_titles", lambda **kwargs: ["milk"])
+    monkeypatch.setattr(run.fuzzy_ui, "generate_fuzzy_match_html", _counting_generate)
+
+    first = run.regenerate_fuzzy_html(tmp_path, "Groceries", products_path)
+    assert run.regenerate_fuzzy_html(tmp_path, "Groceries", products_path) == first
+    assert len(rendered) == 1
+
+    # A products.json change (new mapping) must re-render even with the same tasks.
+    products_path.write_text(json.dumps({"products": {"milk": {}}}), encoding="utf-8")
+    assert run.regenerate_fuzzy_html(tmp_path, "Groceries", products_path) is None
+
+
+def test_search_phase_pages_only_when_interactive(monkeypatch, tmp_path: Path, capsys):
+    (tmp_path / "data").mkdir()
+    products_path = tmp_path / "data" / "products.json"
+    products_path.write_text(json.dumps({"products": {}}), encoding="utf-8")
+
+    import webbrowser
+
+    from grocery import run
+
+    opened = []
+    monkeypatch.setattr(webbrowser, "open", lambda url, new=0: opened.append(url))
+    monkeypatch.setattr(run.gtasks, "fetch_open_task_titles", lambda **kwargs: ["milk"])
+    monkeypatch.delenv("CI", raising=False)
+    argv = ["--list-name", "Groceries", "--repo-root", str(tmp_path), "--products", str(products_path), "--skip-fuzzy"]
+    html = tmp_path / "data" / "unmapped_items.html"
+
+    # Piped stdout (capsys): plain list only.
+    monkeypatch.delenv("GROCERY_INTERACTIVE", raising=False)
+    assert run.main(argv) == 1
+    assert "1. milk" in capsys.readouterr().out
+    assert not html.exists()
+
+    # The server's phase 3 shopper pipes stdout but forces the interactive flow.
+    monkeypatch.setenv("GROCERY_INTERACTIVE", "1")
+    assert run.main(argv) == 1
+    assert html.exists()
+    assert opened == [html.absolute().as_uri()]
+
+
+def test_run_shopping_routes_output_to_on_log(monkeypatch, tmp_path: Path, capsys):
+    import threading
+
+    (tmp_path / "data").mkdir()
+    products_path = tmp_path / "data" / "products.json"
+    products_path.write_text("{not json", encoding="utf-8")
+
+    from grocery import run
+
+    monkeypatch.setattr(run.gtasks, "fetch_open_task_titles", lambda **kwargs: ["milk"])
+
+    lines = []
+    assert run.run_shopping(repo_root=tmp_path, list_name="Groceries", on_log=lines.append) == 3
+    assert any("ERROR [3]" in line for line in lines)
+    assert capsys.readouterr().out == ""
+
+    # A set stop event ends the run at its first line of output.
+    stop = threading.Event()
+    stop.set()
+    lines.clear()
+    code = run.run_shopping(repo_root=tmp_path, list_name="Groceries", on_log=lines.append, stop=stop)
+    assert code == run.STOPPED_EXIT_CODE
+    assert lines == []